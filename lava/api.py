@@ -1,17 +1,21 @@
 import logging
+import os
 from typing import Any, Dict, List, Optional
 
 import aiohttp
 import uvicorn
 from disnake.abc import MISSING
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from lavalink import LoadType
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 
+from lava.classes.artwork_cache import ArtworkCache, parse_if_none_match
 from lava.classes.player import LavaPlayer
-from lava.utils import find_lyrics_within_range
+from lava.source import PagedLoadResult
+from lava.utils import image_sizes
 
 
 class TrackInfo(BaseModel):
@@ -91,6 +95,12 @@ class LavaAPI:
             allow_headers=["*"],
         )
 
+        self.artwork_cache = ArtworkCache(
+            path=os.getenv("ARTWORK_CACHE_PATH", "cache/artwork"),
+            max_memory_items=int(os.getenv("ARTWORK_CACHE_MEMORY_ITEMS", "128")),
+            max_disk_bytes=int(os.getenv("ARTWORK_CACHE_DISK_MB", "256")) * 1024 * 1024,
+        )
+
         self._setup_routes()
 
     def _setup_routes(self):
@@ -114,6 +124,27 @@ class LavaAPI:
                 )
             return {"guilds": guilds}
 
+        @self.app.get("/stats")
+        async def get_stats():
+            """Get runtime statistics of the bot"""
+            players = self.bot.lavalink.player_manager.players.values()
+
+            return {
+                "edits": {
+                    **self.bot.edit_scheduler.stats(),
+                    "sent": sum(player.display_edits_sent for player in players),
+                    "skipped": sum(player.display_edits_skipped for player in players),
+                },
+                "image_sizes": image_sizes.stats(),
+                "http": self.bot.http_client.stats(),
+                "artwork": self.artwork_cache.stats(),
+                "lyrics": self.bot.lyrics_cache.stats(),
+                "look_ahead": self.bot.track_resolver.stats(),
+                "spotify_matches": self.bot.spotify_matches.stats(),
+                "extractors": self.bot.extractor_pool.stats(),
+                "extractions": self.bot.extraction_cache.stats(),
+            }
+
         @self.app.get("/player/{guild_id}", response_model=PlayerState)
         async def get_player_state(guild_id: int):
             """Get current player state for a guild"""
@@ -133,7 +164,9 @@ class LavaAPI:
             return self._serialize_player_state(player).current_track
 
         @self.app.get("/player/{guild_id}/artwork")
-        async def get_current_artwork(guild_id: int):
+        async def get_current_artwork(
+            guild_id: int, if_none_match: Optional[str] = Header(None)
+        ):
             """Get artwork image for currently playing track"""
             player = self._get_player(guild_id)
             self.bot.logger.info("Getting artwork for %s", player.current)
@@ -149,7 +182,7 @@ class LavaAPI:
                     status_code=404, detail="No artwork available for current track"
                 )
 
-            return await self._fetch_artwork(artwork_url)
+            return await self._fetch_artwork(artwork_url, if_none_match)
 
         @self.app.get("/player/{guild_id}/queue", response_model=QueueInfo)
         async def get_queue(
@@ -178,8 +211,7 @@ class LavaAPI:
                 return LyricsInfo(lyrics=[], has_lyrics=False)
 
             all_lyrics = [
-                LyricLineInfo(text=line.text, timestamp=line.time)
-                for line in player.lyrics
+                LyricLineInfo(text=text, timestamp=time) for time, text in player.lyrics
             ]
 
             return LyricsInfo(lyrics=all_lyrics, has_lyrics=True)
@@ -205,14 +237,14 @@ class LavaAPI:
             if player.lyrics is None or player.lyrics == MISSING:
                 return LyricsInfo(lyrics=[], has_lyrics=False)
 
-            current_position_seconds = player.position / 1000
-            lyrics_in_range = find_lyrics_within_range(
-                player.lyrics, current_position_seconds, range_seconds
-            )
+            current_position_seconds = player.interpolated_position / 1000
+            window = player.lyrics.window(current_position_seconds, range_seconds)
 
             ranged_lyrics = [
-                LyricLineInfo(text=line.text, timestamp=line.time)
-                for line in lyrics_in_range
+                LyricLineInfo(text=text, timestamp=time)
+                for time, text in zip(
+                    player.lyrics.times[window], player.lyrics.texts[window]
+                )
             ]
 
             return LyricsInfo(lyrics=ranged_lyrics, has_lyrics=True)
@@ -250,6 +282,31 @@ class LavaAPI:
             if not player.is_playing:
                 await player.play()
 
+            # Playback has started with the first page, add the pages which are still loading
+            # right after the playlist, the queue may have changed since the first page was added
+            if isinstance(results, PagedLoadResult):
+                last_added = results.tracks[-1]
+
+                try:
+                    async for tracks in results.remaining:
+                        page_index = player.index_after(last_added)
+
+                        for iter_index, track in enumerate(tracks):
+                            player.add(
+                                requester=0,
+                                track=track,
+                                index=page_index + iter_index,
+                            )
+                            added_tracks.append(self._serialize_track(track))
+
+                            last_added = track
+                except Exception as e:
+                    self.logger.error(
+                        "Failed to load the remaining tracks of %s: %s",
+                        results.playlist_info.name,
+                        e,
+                    )
+
             player.set_shuffle(shuffle=request.shuffle)
 
             return {
@@ -442,29 +499,26 @@ class LavaAPI:
 
             return {"filters": list(player.filters.keys())}
 
-    async def _fetch_artwork(self, artwork_url: str) -> Response:
-        """Fetch artwork image from URL and return as Response"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(artwork_url) as response:
-                    if response.status != 200:
-                        raise HTTPException(
-                            status_code=404,
-                            detail="Artwork not found or unavailable",
-                        )
-
-                    image_data = await response.read()
-                    content_type = response.headers.get("content-type", "image/jpeg")
-
-                    return Response(
-                        content=image_data,
-                        media_type=content_type,
-                        headers={
-                            "Cache-Control": "public, max-age=3600",
-                            "Content-Length": str(len(image_data)),
-                        },
-                    )
+    async def _fetch_artwork(
+        self, artwork_url: str, if_none_match: Optional[str] = None
+    ) -> Response:
+        """Serve artwork image from cache, or stream it from URL while caching it"""
+        etag = self.artwork_cache.etag(artwork_url)
+        headers = {"Cache-Control": "public, max-age=3600", "ETag": etag}
 
+        if etag in parse_if_none_match(if_none_match):
+            self.artwork_cache.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        artwork = await self.artwork_cache.get(artwork_url)
+
+        if artwork is not None:
+            return Response(
+                content=artwork.data, media_type=artwork.content_type, headers=headers
+            )
+
+        try:
+            response = await self.bot.http_client.session.get(artwork_url)
         except aiohttp.ClientError as e:
             raise HTTPException(
                 status_code=503, detail=f"Failed to fetch artwork: {str(e)}"
@@ -475,6 +529,26 @@ class LavaAPI:
                 detail=f"Internal error while fetching artwork: {str(e)}",
             )
 
+        if response.status != 200:
+            response.release()
+            raise HTTPException(
+                status_code=404,
+                detail="Artwork not found or unavailable",
+            )
+
+        if (
+            response.content_length is not None
+            and "Content-Encoding" not in response.headers
+        ):
+            headers["Content-Length"] = str(response.content_length)
+
+        return StreamingResponse(
+            self.artwork_cache.stream(response, artwork_url),
+            media_type=response.headers.get("content-type", "image/jpeg"),
+            headers=headers,
+            background=BackgroundTask(response.release),
+        )
+
     def _get_player(self, guild_id: int) -> LavaPlayer:
         """Get player for guild, raise HTTP exception if not found"""
         if not self.bot.is_ready():
@@ -510,7 +584,7 @@ class LavaAPI:
 
         if player.current:
             current_track = self._serialize_track(player.current)
-            current_track.position = player.position
+            current_track.position = player.interpolated_position
 
         return PlayerState(
             is_playing=player.is_playing,
@@ -521,7 +595,7 @@ class LavaAPI:
             loop_mode=player.loop,
             shuffle=player.shuffle,
             autoplay=player.autoplay,
-            position=player.position,
+            position=player.interpolated_position,
             filters=list(player.filters.keys()),
             lyrics_loaded=player.lyrics is not None,
         )
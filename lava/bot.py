@@ -3,13 +3,30 @@ import json
 import logging
 import os
 from logging import Logger
-from typing import Optional
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 from disnake import Locale
 from disnake.ext.commands import Bot as OriginalBot
+from disnake.ui import ActionRow
 
+from lava.classes.edit_scheduler import EditScheduler
+from lava.classes.extraction_cache import ExtractionCache
+from lava.classes.extractor_pool import ExtractorPool
+from lava.classes.http_client import HTTPClient
 from lava.classes.lavalink_client import LavalinkClient
-from lava.source import SourceManager
+from lava.classes.lyrics import LyricsCache
+from lava.classes.match_cache import MatchCache
+from lava.classes.track_resolver import TrackResolver
+from lava.source import YTDL_OPTIONS, SourceManager
+
+ICONS_PATH = "configs/icons.json"
+
+# Locales without their own localization file use the texts of these locales instead
+LOCALE_FALLBACKS = {
+    "en-GB": "en-US",
+}
 
 
 class Bot(OriginalBot):
@@ -25,15 +42,80 @@ class Bot(OriginalBot):
         self.api_host = os.getenv("API_HOST", "0.0.0.0")
         self.api_port = int(os.getenv("API_PORT", "8000"))
 
-        with open("configs/icons.json", "r", encoding="utf-8") as f:
-            self.icons = json.load(f)
+        self.edit_scheduler = EditScheduler(
+            rate=float(os.getenv("DISPLAY_EDIT_RATE", "10")),
+            burst=int(os.getenv("DISPLAY_EDIT_BURST", "10")),
+            max_periodic=int(os.getenv("DISPLAY_EDIT_QUEUE_LIMIT", "100")),
+        )
+
+        self.http_client = HTTPClient(
+            limit_per_host=int(os.getenv("HTTP_LIMIT_PER_HOST", "10")),
+            dns_cache_ttl=int(os.getenv("HTTP_DNS_CACHE_TTL", "300")),
+            keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30")),
+            timeout=float(os.getenv("HTTP_TIMEOUT", "15")),
+        )
+
+        self.lyrics_cache = LyricsCache(
+            path=os.getenv("LYRICS_CACHE_PATH", "cache/lyrics.sqlite3"),
+            max_memory_items=int(os.getenv("LYRICS_CACHE_MEMORY_ITEMS", "256")),
+            ttl=float(os.getenv("LYRICS_CACHE_TTL", str(30 * 24 * 60 * 60))),
+            missing_ttl=float(os.getenv("LYRICS_CACHE_MISSING_TTL", str(6 * 60 * 60))),
+            prefetch_concurrency=int(os.getenv("LYRICS_PREFETCH_CONCURRENCY", "2")),
+            providers=os.getenv("LYRICS_PROVIDERS", "NetEase,Lrclib").split(","),
+            workers=int(os.getenv("LYRICS_WORKERS", "8")),
+            timeout=float(os.getenv("LYRICS_TIMEOUT", "10")),
+        )
+        self.lyrics_prefetch_window = float(os.getenv("LYRICS_PREFETCH_WINDOW", "30"))
+
+        self.spotify_matches = MatchCache(
+            path=os.getenv("SPOTIFY_CACHE_PATH", "cache/spotify.sqlite3"),
+            table="matches",
+            max_memory_items=int(os.getenv("SPOTIFY_MATCH_CACHE_MEMORY_ITEMS", "1024")),
+            ttl=float(os.getenv("SPOTIFY_MATCH_CACHE_TTL", str(30 * 24 * 60 * 60))),
+        )
+
+        self.extractor_pool = ExtractorPool(
+            max_workers=int(os.getenv("EXTRACTOR_WORKERS", "2")),
+            timeout=float(os.getenv("EXTRACTOR_TIMEOUT", "30")),
+            warm_options=(YTDL_OPTIONS,),
+        )
+
+        self.extraction_cache = ExtractionCache(
+            max_items=int(os.getenv("EXTRACTION_CACHE_ITEMS", "256")),
+            default_ttl=float(os.getenv("EXTRACTION_CACHE_TTL", "600")),
+            expiry_margin=float(os.getenv("EXTRACTION_CACHE_EXPIRY_MARGIN", "300")),
+        )
+
+        self.track_resolver = TrackResolver(
+            look_ahead=int(os.getenv("LOOK_AHEAD_TRACKS", "3")),
+            concurrency=int(os.getenv("LOOK_AHEAD_CONCURRENCY", "4")),
+        )
+
+        self.icons: dict = {}
+        self.icon_index: Dict[str, Any] = {}
+        self.icons_reload_interval = float(os.getenv("ICONS_RELOAD_INTERVAL", "10"))
+        self.icons_watcher_task = None
+
+        self.progress_bar_width = int(os.getenv("PROGRESS_BAR_WIDTH", "10"))
+        self.progress_bars: List[str] = []
+        self.texts: Dict[Union[Locale, str], Mapping[str, str]] = {}
+        self.control_panels: Dict[tuple, List[ActionRow]] = {}
+
+        self.__icons_mtime = os.path.getmtime(ICONS_PATH)
+        self.load_icons()
 
     async def on_ready(self):
         self.logger.info("The bot is ready! Logged in as %s" % self.user)
 
+        await self.http_client.start()
+        self.extractor_pool.start()
+
         self.__setup_lavalink_client()
         await self.__setup_api_server()
 
+        if self.icons_watcher_task is None and self.icons_reload_interval > 0:
+            self.icons_watcher_task = asyncio.create_task(self.__watch_icons())
+
     @property
     def lavalink(self) -> LavalinkClient:
         if not self.is_ready():
@@ -65,7 +147,7 @@ class Bot(OriginalBot):
 
         self.logger.info("Done loading lavalink nodes!")
 
-        self.lavalink.register_source(SourceManager())
+        self.lavalink.register_source(SourceManager(self))
 
     async def __setup_api_server(self):
         """
@@ -105,8 +187,141 @@ class Bot(OriginalBot):
                 pass
             self.logger.info("API server stopped")
 
+        if self.icons_watcher_task:
+            self.icons_watcher_task.cancel()
+
+        await self.http_client.close()
+
+        self.lyrics_cache.close()
+        self.spotify_matches.close()
+        self.extractor_pool.close()
+
         await super().close()
 
+    def load_icons(self):
+        """
+        Load the icons from configs/icons.json into a flat index of dotted names,
+        and drop the display caches built from the old ones.
+        The new icons replace the old ones at once, only after the whole file is loaded.
+        """
+        with open(ICONS_PATH, "r", encoding="utf-8") as f:
+            icons = json.load(f)
+
+        self.icons, self.icon_index = icons, self.__flatten_icons(icons)
+        self.progress_bars = self.__build_progress_bars()
+
+        self.control_panels.clear()
+
+    async def __watch_icons(self):
+        """
+        Reload the icons whenever configs/icons.json is modified
+        """
+        while True:
+            await asyncio.sleep(self.icons_reload_interval)
+
+            try:
+                mtime = os.path.getmtime(ICONS_PATH)
+
+                if mtime == self.__icons_mtime:
+                    continue
+
+                self.__icons_mtime = mtime
+
+                self.load_icons()
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Failed to reload icons: {e}")
+                continue
+
+            self.logger.info("Reloaded icons from %s", ICONS_PATH)
+
+    def __flatten_icons(self, icons: dict, prefix: str = "") -> Dict[str, Any]:
+        """
+        Flatten the nested icons into a dict keyed by dotted names, e.g. "control.pause"
+        :param icons: The icons to flatten
+        :param prefix: The dotted name of the icons
+        :return: The flattened icons, including the nested groups
+        """
+        index = {}
+
+        for key, value in icons.items():
+            name = prefix + key
+
+            index[name] = value
+
+            if isinstance(value, dict):
+                index.update(self.__flatten_icons(value, name + "."))
+
+        return index
+
+    def __build_progress_bars(self) -> List[str]:
+        """
+        Build every state of the progress bar from the icons.
+        :return: The progress bars indexed by the amount of filled cells,
+            followed by the bar of a finished track
+        """
+        start_point = self.get_icon("progress.start_point", "ST|")
+        start_fill = self.get_icon("progress.start_fill", "SF|")
+        mid_point = self.get_icon("progress.mid_point", "MP|")
+        end_fill = self.get_icon("progress.end_fill", "EF|")
+        end = self.get_icon("progress.end", "ED|")
+        end_point = self.get_icon("progress.end_point", "EP")
+
+        width = self.progress_bar_width
+
+        bars = [
+            f"{start_point}{start_fill * filled}{mid_point}{end_fill * (width - filled)}{end}"
+            for filled in range(width + 1)
+        ]
+
+        bars.append(f"{start_point}{start_fill * (width + 1)}{end_point}")
+
+        return bars
+
+    def load_locales(self, path: str):
+        """
+        Load the localization files in the given path, and drop the display caches built from the old ones
+        :param path: The path to the localization files
+        """
+        self.i18n.load(path)
+
+        self.__compile_texts(path)
+
+        self.control_panels.clear()
+
+    def __compile_texts(self, path: str):
+        """
+        Flatten the loaded localizations into one read-only table per locale,
+        keyed by both the Locale and its string value, so get_text is a single lookup.
+        :param path: The path to the localization files
+        """
+        keys = set()
+
+        for file in Path(path).glob("*.json"):
+            with open(file, "r", encoding="utf-8") as f:
+                keys.update(json.load(f))
+
+        tables: Dict[str, Dict[str, str]] = {}
+
+        for key in keys:
+            for locale, text in (self.i18n.get(key) or {}).items():
+                tables.setdefault(locale, {})[key] = text
+
+        for locale, fallback in LOCALE_FALLBACKS.items():
+            if fallback in tables:
+                tables[locale] = {**tables[fallback], **tables.get(locale, {})}
+
+        texts = {}
+
+        for locale, table in tables.items():
+            texts[locale] = table = MappingProxyType(table)
+
+            try:
+                texts[Locale(locale)] = table
+            except ValueError:
+                pass
+
+        self.texts = texts
+
     def get_text(self, key: str, locale: Locale, default: str = None) -> str:
         """
         Gets a text from i18n files by key
@@ -115,7 +330,12 @@ class Bot(OriginalBot):
         :param default: The default value to return if the text is not found
         :return: The text
         """
-        return self.i18n.get(key).get(str(locale), default)
+        table = self.texts.get(locale)
+
+        if table is None:
+            return default
+
+        return table.get(key, default)
 
     def get_icon(self, name: str, default: any) -> any:
         """
@@ -124,12 +344,4 @@ class Bot(OriginalBot):
         :param default: The default value to return if the icon is not found
         :return: The icon
         """
-        dct = self.icons.copy()
-
-        for key in name.split("."):
-            try:
-                dct = dct[key]
-            except KeyError:
-                return default
-
-        return dct
+        return self.icon_index.get(name, default)
@@ -0,0 +1,240 @@
+import asyncio
+import os
+from hashlib import sha256
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import aiohttp
+
+from lava.classes.cache import LRUCache
+
+
+class Artwork:
+    """A cached artwork image"""
+
+    __slots__ = ("data", "content_type", "etag")
+
+    def __init__(self, data: bytes, content_type: str, etag: str):
+        self.data = data
+        self.content_type = content_type
+        self.etag = etag
+
+
+class ArtworkCache:
+    """
+    Caches artwork images fetched from upstream in memory and on disk, keyed by the hash of their URL.
+
+    Artwork URLs point to immutable images, so the hash of the URL also serves as the ETag of the image.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        max_memory_items: int,
+        max_disk_bytes: int,
+        max_image_bytes: int = 8 * 1024 * 1024,
+    ):
+        """
+        :param path: The directory to store the disk tier in.
+        :param max_memory_items: The maximum amount of images to keep in memory.
+        :param max_disk_bytes: The maximum total size of the images on disk,
+            the least recently written images are removed beyond this.
+        :param max_image_bytes: Images larger than this are streamed but not cached.
+        """
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self.max_image_bytes = max_image_bytes
+
+        self.memory: LRUCache[str, Artwork] = LRUCache(maxsize=max_memory_items)
+
+        self.disk_hits: int = 0
+        self.upstream_fetches: int = 0
+        self.not_modified: int = 0
+
+        self._fills: Dict[str, asyncio.Future] = {}
+
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(url: str) -> str:
+        """
+        Get the cache key of an artwork URL.
+
+        :param url: The URL of the artwork.
+        :return: The hex digest of the URL.
+        """
+        return sha256(url.encode()).hexdigest()
+
+    @classmethod
+    def etag(cls, url: str) -> str:
+        """
+        Get the ETag of an artwork URL.
+
+        :param url: The URL of the artwork.
+        :return: The quoted ETag.
+        """
+        return f'"{cls.key(url)[:32]}"'
+
+    async def get(self, url: str) -> Optional[Artwork]:
+        """
+        Get a cached artwork, from memory first and then from disk.
+        If a fetch of the artwork is in progress, wait for it instead.
+
+        :param url: The URL of the artwork.
+        :return: The cached artwork, None if it's not cached.
+        """
+        key = self.key(url)
+
+        artwork = self.memory.get(key)
+
+        if artwork is not None:
+            return artwork
+
+        fill = self._fills.get(key)
+
+        if fill is not None:
+            return await asyncio.shield(fill)
+
+        artwork = await asyncio.get_running_loop().run_in_executor(
+            None, self.__read, key, self.etag(url)
+        )
+
+        if artwork is not None:
+            self.disk_hits += 1
+            self.memory.set(key, artwork)
+
+        return artwork
+
+    async def stream(
+        self, response: aiohttp.ClientResponse, url: str
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an upstream response while filling the cache with it.
+        The response is released once the stream is finished or abandoned,
+        and the image is only cached if it was read completely.
+
+        :param response: The upstream response of the artwork.
+        :param url: The URL of the artwork.
+        """
+        key = self.key(url)
+        content_type = response.headers.get("content-type", "image/jpeg")
+
+        fill = None
+
+        if key not in self._fills:
+            fill = self._fills[key] = asyncio.get_running_loop().create_future()
+
+        self.upstream_fetches += 1
+
+        data = bytearray()
+        artwork = None
+
+        try:
+            async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                if data is not None:
+                    data += chunk
+
+                    if len(data) > self.max_image_bytes:
+                        data = None
+
+                yield chunk
+
+            if data is not None:
+                artwork = Artwork(bytes(data), content_type, self.etag(url))
+
+                self.memory.set(key, artwork)
+
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self.__write, key, artwork
+                )
+        finally:
+            response.release()
+
+            if fill is not None:
+                del self._fills[key]
+                fill.set_result(artwork)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the cache.
+
+        :return: The memory tier statistics, disk hit count, upstream fetch count and not modified response count.
+        """
+        return {
+            "memory": self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "upstream_fetches": self.upstream_fetches,
+            "not_modified": self.not_modified,
+        }
+
+    def __file(self, key: str) -> str:
+        return os.path.join(self.path, key)
+
+    def __read(self, key: str, etag: str) -> Optional[Artwork]:
+        try:
+            with open(self.__file(key), "rb") as f:
+                content_type = f.readline().decode().strip()
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        return Artwork(data, content_type, etag)
+
+    def __write(self, key: str, artwork: Artwork):
+        temp = self.__file(key) + ".tmp"
+
+        with open(temp, "wb") as f:
+            f.write(artwork.content_type.encode() + b"\n")
+            f.write(artwork.data)
+
+        os.replace(temp, self.__file(key))
+
+        self.__prune()
+
+    def __prune(self):
+        """
+        Remove the least recently written images until the disk tier fits in its budget.
+        """
+        files = []
+        total = 0
+
+        for entry in os.scandir(self.path):
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+
+            stat = entry.stat()
+
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total <= self.max_disk_bytes:
+            return
+
+        files.sort()
+
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            total -= size
+
+
+def parse_if_none_match(header: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse the ETags of an If-None-Match header.
+
+    :param header: The value of the header.
+    :return: The ETags in the header, weak ETags are compared as strong ones.
+    """
+    if not header:
+        return ()
+
+    tags = (tag.strip() for tag in header.split(","))
+
+    return tuple(tag[2:] if tag.startswith("W/") else tag for tag in tags if tag)
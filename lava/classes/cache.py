@@ -0,0 +1,176 @@
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+MISSING: Any = object()
+
+
+class _Load:
+    """A load in progress, shared by everyone waiting for the same key"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters: int = 0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A size bounded, least recently used cache with optional expiry of entries.
+    Concurrent loads of the same key are deduplicated by get_or_load.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        """
+        :param maxsize: The maximum amount of entries to keep.
+        :param ttl: The default time to live of the entries in seconds, None to never expire.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._entries: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+        self._loads: Dict[K, _Load] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._entries.get(key)
+
+        return entry is not None and (entry[1] is None or entry[1] > monotonic())
+
+    def get(self, key: K, default: Any = None) -> Optional[V]:
+        """
+        Get an entry and mark it as recently used.
+
+        :param key: The key of the entry.
+        :param default: The value to return if the entry is not found or expired.
+        :return: The value of the entry.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+
+        if expires_at is not None and expires_at <= monotonic():
+            del self._entries[key]
+
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = MISSING):
+        """
+        Set an entry, evicting the least recently used entries if the cache is full.
+
+        :param key: The key of the entry.
+        :param value: The value of the entry.
+        :param ttl: The time to live of this entry in seconds, defaults to the ttl of the cache.
+        """
+        if ttl is MISSING:
+            ttl = self.ttl
+
+        self._entries[key] = (value, None if ttl is None else monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K, default: Any = None) -> Optional[V]:
+        """
+        Remove an entry.
+
+        :param key: The key of the entry.
+        :param default: The value to return if the entry is not found.
+        :return: The value of the removed entry.
+        """
+        entry = self._entries.pop(key, None)
+
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[V]],
+        ttl: Optional[Callable[[V], Optional[float]]] = None,
+    ) -> V:
+        """
+        Get an entry, loading and caching it if it's not cached yet.
+        Concurrent calls for the same key wait on a single load, which is
+        cancelled only when everyone waiting for it is cancelled.
+
+        :param key: The key of the entry.
+        :param loader: A function returning an awaitable which loads the value of the entry.
+        :param ttl: A function returning the time to live of a loaded value, defaults to the ttl of the cache.
+        :return: The value of the entry.
+        """
+        value = self.get(key, MISSING)
+
+        if value is not MISSING:
+            return value
+
+        load = self._loads.get(key)
+
+        if load is None:
+            load = self._loads[key] = _Load(
+                asyncio.create_task(self.__load(key, loader, ttl))
+            )
+            load.task.add_done_callback(lambda _: self._loads.pop(key, None))
+
+        load.waiters += 1
+
+        try:
+            return await asyncio.shield(load.task)
+        except asyncio.CancelledError:
+            if load.waiters == 1 and not load.task.done():
+                load.task.cancel()
+
+            raise
+        finally:
+            load.waiters -= 1
+
+    async def __load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[V]],
+        ttl: Optional[Callable[[V], Optional[float]]],
+    ) -> V:
+        value = await loader()
+
+        self.set(key, value, MISSING if ttl is None else ttl(value))
+
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the statistics of the cache.
+
+        :return: The size, hit and miss counts of the cache, and the amount of loads in progress.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "loading": len(self._loads),
+        }
@@ -0,0 +1,208 @@
+import asyncio
+from collections import OrderedDict, deque
+from time import monotonic
+from typing import Deque, Dict, Optional
+
+
+class FairQueue:
+    """A queue of waiters which takes turns between guilds"""
+
+    def __init__(self):
+        self._guilds: "OrderedDict[int, Deque[asyncio.Future]]" = OrderedDict()
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, guild_id: int, future: asyncio.Future):
+        """
+        Add a waiter to the end of the guild's queue.
+
+        :param guild_id: The guild the waiter belongs to.
+        :param future: The future to resolve when it's the waiter's turn.
+        """
+        self._guilds.setdefault(guild_id, deque()).append(future)
+        self._size += 1
+
+    def pop(self) -> asyncio.Future:
+        """
+        Pop the next waiter, then move its guild to the back of the line.
+
+        :return: The future of the waiter.
+        """
+        guild_id, waiters = next(iter(self._guilds.items()))
+
+        future = waiters.popleft()
+        self._size -= 1
+
+        if waiters:
+            self._guilds.move_to_end(guild_id)
+        else:
+            del self._guilds[guild_id]
+
+        return future
+
+    def remove(self, guild_id: int, future: asyncio.Future):
+        """
+        Remove a waiter from the queue, if it's still in there.
+
+        :param guild_id: The guild the waiter belongs to.
+        :param future: The future of the waiter.
+        """
+        waiters = self._guilds.get(guild_id)
+
+        if not waiters or future not in waiters:
+            return
+
+        waiters.remove(future)
+        self._size -= 1
+
+        if not waiters:
+            del self._guilds[guild_id]
+
+    def take(self, guild_id: int) -> Deque[asyncio.Future]:
+        """
+        Remove all waiters of a guild from the queue.
+
+        :param guild_id: The guild to remove the waiters of.
+        :return: The removed waiters, in order.
+        """
+        waiters = self._guilds.pop(guild_id, deque())
+        self._size -= len(waiters)
+
+        return waiters
+
+
+class EditScheduler:
+    """
+    Hands out message edit slots for all players within an edits per second budget.
+
+    Interactive edits (commands, button presses) are always granted before periodic
+    refreshes, and guilds take turns within each priority, so a busy guild can't starve others.
+    """
+
+    def __init__(self, rate: float, burst: int, max_periodic: int):
+        """
+        :param rate: The amount of edits allowed per second.
+        :param burst: The amount of edits that can be granted at once after being idle.
+        :param max_periodic: The maximum amount of periodic edits waiting for a slot,
+            periodic edits beyond this are dropped.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_periodic = max_periodic
+
+        self.granted: int = 0
+        self.dropped: int = 0
+
+        self._tokens: float = burst
+        self._last_refill: float = monotonic()
+
+        self._interactive = FairQueue()
+        self._periodic = FairQueue()
+
+        self._task: Optional[asyncio.Task] = None
+
+    async def acquire(self, guild_id: int, periodic: bool = False) -> bool:
+        """
+        Wait for an edit slot.
+
+        :param guild_id: The guild which wants to edit its display.
+        :param periodic: Whether the edit is a periodic refresh instead of a response to a user.
+        :return: Whether the slot was granted, False if the edit was dropped.
+        """
+        if self.try_acquire():
+            return True
+
+        if periodic and len(self._periodic) >= self.max_periodic:
+            self.dropped += 1
+
+            return False
+
+        queue = self._periodic if periodic else self._interactive
+
+        future = asyncio.get_running_loop().create_future()
+        queue.push(guild_id, future)
+
+        if self._task is None:
+            self._task = asyncio.create_task(self.__dispatch())
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            self._interactive.remove(guild_id, future)
+            self._periodic.remove(guild_id, future)
+            raise
+
+        return True
+
+    def try_acquire(self) -> bool:
+        """
+        Take an edit slot if one is free right now, without waiting.
+
+        :return: Whether a slot was taken, False if the edit would have to wait for one.
+        """
+        self.__refill()
+
+        if self._tokens < 1 or self._interactive or self._periodic:
+            return False
+
+        self._tokens -= 1
+        self.granted += 1
+
+        return True
+
+    def promote(self, guild_id: int):
+        """
+        Move the periodic edits of a guild to the interactive queue,
+        used when a user is waiting for an edit that is already queued.
+
+        :param guild_id: The guild to promote the edits of.
+        """
+        for future in self._periodic.take(guild_id):
+            self._interactive.push(guild_id, future)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the statistics of the scheduler.
+
+        :return: The queue depth of each priority, and the granted and dropped edit counts.
+        """
+        return {
+            "interactive_queue": len(self._interactive),
+            "periodic_queue": len(self._periodic),
+            "granted": self.granted,
+            "dropped": self.dropped,
+        }
+
+    def __refill(self):
+        now = monotonic()
+
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+    async def __dispatch(self):
+        """
+        Grant edit slots to the waiters as the budget allows, until nobody is waiting.
+        """
+        try:
+            while self._interactive or self._periodic:
+                self.__refill()
+
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    continue
+
+                future = (self._interactive or self._periodic).pop()
+
+                if future.done():  # The waiter was cancelled
+                    continue
+
+                self._tokens -= 1
+                self.granted += 1
+
+                future.set_result(None)
+        finally:
+            self._task = None
@@ -0,0 +1,150 @@
+import re
+from datetime import datetime, timezone
+from time import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, TypeVar
+from urllib.parse import parse_qsl, urlparse
+
+from lava.classes.cache import LRUCache
+
+T = TypeVar("T")
+
+# Query parameters holding the time since epoch a signed media URL expires at, lowercased
+EXPIRY_PARAMS = ("deadline", "expire", "expires", "x-expires")
+
+expire_path_rx = re.compile(r"/expire/(\d+)(?:/|$)")
+
+
+class ExtractedMedia(NamedTuple):
+    """The fields of an extraction result a track is built from, as cached"""
+
+    url: str
+    title: Optional[str]
+    author: Optional[str]
+    thumbnail: Optional[str]
+    webpage_url: Optional[str]
+
+
+def get_media_expiry(url: str) -> Optional[float]:
+    """
+    Get when a signed media URL expires, from the expiry parameters commonly used by media hosts,
+    such as deadline on Bilibili, expire on YouTube and X-Amz-Expires on S3.
+
+    :param url: The media URL.
+    :return: The time since epoch the URL expires at, None if the URL doesn't tell.
+    """
+    parsed = urlparse(url)
+    params = {key.lower(): value for key, value in parse_qsl(parsed.query)}
+
+    for param in EXPIRY_PARAMS:
+        if params.get(param, "").isdigit():
+            return float(params[param])
+
+    if params.get("x-amz-date") and params.get("x-amz-expires", "").isdigit():
+        try:
+            signed_at = _parse_amz_date(params["x-amz-date"])
+        except ValueError:
+            return None
+
+        return signed_at + float(params["x-amz-expires"])
+
+    match = expire_path_rx.search(parsed.path)
+
+    if match:
+        return float(match.group(1))
+
+    return None
+
+
+def _parse_amz_date(value: str) -> float:
+    """
+    Parse a date in the basic ISO 8601 format of AWS signatures, such as 20240101T000000Z.
+    """
+    return (
+        datetime.strptime(value, "%Y%m%dT%H%M%SZ")
+        .replace(tzinfo=timezone.utc)
+        .timestamp()
+    )
+
+
+class ExtractionCache:
+    """
+    Process wide cache of extraction results, shared by all players, so queueing the same URL again
+    doesn't run the extraction again while the media URL it resolved to is still valid.
+
+    Results are cached until shortly before their media URL expires, according to its expiry parameters,
+    or for a default time if it has none. A cached media URL Lavalink fails to load is extracted again, once.
+    """
+
+    def __init__(self, max_items: int, default_ttl: float, expiry_margin: float):
+        """
+        :param max_items: The maximum amount of results to keep.
+        :param default_ttl: How long to cache results whose media URL doesn't tell when it expires, in seconds.
+        :param expiry_margin: How long before their media URL expires to stop serving results, in seconds.
+        """
+        self.default_ttl = default_ttl
+        self.expiry_margin = expiry_margin
+
+        self.memory: LRUCache[str, ExtractedMedia] = LRUCache(maxsize=max_items)
+
+        self.reextractions: int = 0
+
+    def ttl(self, media: ExtractedMedia) -> float:
+        """
+        Get how long to cache an extraction result for.
+
+        :param media: The extraction result.
+        :return: The time to live of the result in seconds, 0 or less if it shouldn't be cached.
+        """
+        expires_at = get_media_expiry(media.url)
+
+        if expires_at is None:
+            return self.default_ttl
+
+        return expires_at - time() - self.expiry_margin
+
+    async def get(
+        self, url: str, extract: Callable[[], Awaitable[ExtractedMedia]]
+    ) -> ExtractedMedia:
+        """
+        Get the extraction result of a URL, extracting it if it's not cached or about to expire.
+
+        :param url: The URL to extract.
+        :param extract: A function returning an awaitable which extracts the URL.
+        :return: The extraction result.
+        """
+        return await self.memory.get_or_load(url, extract, self.ttl)
+
+    async def load(
+        self,
+        url: str,
+        extract: Callable[[], Awaitable[ExtractedMedia]],
+        load: Callable[[ExtractedMedia], Awaitable[Optional[T]]],
+    ) -> Optional[T]:
+        """
+        Get the extraction result of a URL and load it,
+        extracting the URL again if a cached result fails to load, in case its media URL was revoked early.
+
+        :param url: The URL to extract.
+        :param extract: A function returning an awaitable which extracts the URL.
+        :param load: A function returning an awaitable which loads an extraction result, resolving to None if it fails.
+        :return: The loaded extraction result, None if it fails to load.
+        """
+        cached = url in self.memory
+
+        result = await load(await self.get(url, extract))
+
+        if result is None and cached:
+            self.reextractions += 1
+            self.memory.pop(url)
+
+            result = await load(await self.get(url, extract))
+
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the statistics of the cache.
+
+        :return: The cache statistics, and the amount of cached results which failed to load and were extracted again.
+        """
+        return {**self.memory.stats(), "reextractions": self.reextractions}
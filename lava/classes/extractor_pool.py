@@ -0,0 +1,288 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.process import BaseProcess
+from time import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import YoutubeDLError
+
+from lava.errors import ExtractionError
+
+_ytdl_instances: Dict[Tuple[Tuple[str, Any], ...], YoutubeDL] = {}
+
+
+def _get_ytdl(options: Tuple[Tuple[str, Any], ...]) -> YoutubeDL:
+    """
+    Get the YoutubeDL instance of a worker process with the given options,
+    so the extractors are only set up once per process.
+    """
+    ytdl = _ytdl_instances.get(options)
+
+    if ytdl is None:
+        ytdl = _ytdl_instances[options] = YoutubeDL(dict(options))
+
+    return ytdl
+
+
+def _warm_up(options: Tuple[Tuple[str, Any], ...]):
+    _get_ytdl(options)
+
+
+def _extract(
+    url: str, options: Tuple[Tuple[str, Any], ...]
+) -> Tuple[float, float, Dict[str, Any]]:
+    """
+    Runs in a worker process.
+
+    :return: When the extraction started and finished, and the sanitized info of the URL.
+    :raises ExtractionError: If yt-dlp failed to extract the URL, its own errors may not be picklable.
+    """
+    started_at = time()
+
+    ytdl = _get_ytdl(options)
+
+    try:
+        info = ytdl.sanitize_info(ytdl.extract_info(url, download=False))
+    except YoutubeDLError as error:
+        raise ExtractionError(str(error)) from None
+
+    return started_at, time(), info
+
+
+class ExtractorStats:
+    """Extraction statistics of an extractor"""
+
+    __slots__ = (
+        "pending",
+        "completed",
+        "failed",
+        "timed_out",
+        "total_wait",
+        "max_wait",
+        "total_run",
+        "max_run",
+    )
+
+    def __init__(self):
+        self.pending: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.timed_out: int = 0
+
+        self.total_wait: float = 0
+        self.max_wait: float = 0
+        self.total_run: float = 0
+        self.max_run: float = 0
+
+    def record(self, submitted_at: float, started_at: float, finished_at: float):
+        wait = max(started_at - submitted_at, 0)
+        run = finished_at - started_at
+
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.total_run += run
+        self.max_run = max(self.max_run, run)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "average_wait": self.total_wait / self.completed if self.completed else 0,
+            "max_wait": self.max_wait,
+            "average_run": self.total_run / self.completed if self.completed else 0,
+            "max_run": self.max_run,
+        }
+
+
+class ExtractorPool:
+    """
+    Runs yt-dlp extractions in a pool of worker processes, so slow or CPU heavy extractions
+    can't block the event loop, and run in parallel with each other.
+
+    The workers are spawned and set up when the pool starts, and every extraction has a deadline.
+    Extractions which time out or are cancelled before a worker picks them up are never run.
+    Workers can't be interrupted, so when a running extraction times out the pool is replaced,
+    and the old workers are killed once the other extractions running in them had their time.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        timeout: float,
+        warm_options: Tuple[Dict[str, Any], ...] = (),
+    ):
+        """
+        :param max_workers: The amount of worker processes.
+        :param timeout: The deadline of each extraction in seconds.
+        :param warm_options: The YoutubeDL options to set up in each worker when it's spawned.
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.warm_options = warm_options
+
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+        self.extractors: Dict[str, ExtractorStats] = {}
+
+    def start(self):
+        """
+        Spawn the worker processes and set up YoutubeDL in each of them,
+        does nothing if they're already spawned.
+        """
+        if self.executor is not None:
+            return
+
+        # Forking a process with threads running is unsafe, and the bot runs a few
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+        for _ in range(self.max_workers):
+            for options in self.warm_options:
+                self.executor.submit(_warm_up, self.__freeze(options))
+
+    async def extract(
+        self, extractor: str, url: str, options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Extract the info of a URL without downloading it.
+
+        :param extractor: The name of the extractor to record the statistics of the extraction under.
+        :param url: The URL to extract.
+        :param options: The YoutubeDL options to extract with.
+        :return: The info of the URL.
+        :raises ExtractionError: If yt-dlp failed to extract the URL.
+        :raises asyncio.TimeoutError: If the extraction didn't finish before its deadline.
+        """
+        self.start()
+
+        stats = self.extractors.setdefault(extractor, ExtractorStats())
+
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        submitted_at = time()
+
+        try:
+            future = executor.submit(_extract, url, self.__freeze(options))
+        except BrokenProcessPool:
+            self.__restart(executor)
+            raise ExtractionError("The extractor processes crashed") from None
+
+        stats.pending += 1
+
+        future.add_done_callback(
+            lambda f: self.__call_soon(loop, self.__on_done, f, stats, submitted_at)
+        )
+
+        try:
+            _, _, info = await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout
+            )
+        except asyncio.TimeoutError:
+            stats.timed_out += 1
+
+            # The worker is likely stuck on the site, and would be held by it for good otherwise
+            if future.running():
+                self.__recycle(executor)
+
+            raise
+        except BrokenProcessPool:
+            self.__restart(executor)
+            raise ExtractionError("The extractor processes crashed") from None
+
+        return info
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the pool.
+
+        :return: The worker count, and the amount of extractions pending, completed, failed and timed out,
+            and the average and max queue wait and extraction time in seconds of successful extractions,
+            of each extractor.
+        """
+        return {
+            "workers": self.max_workers,
+            "extractors": {
+                extractor: stats.to_dict()
+                for extractor, stats in self.extractors.items()
+            },
+        }
+
+    def close(self):
+        """
+        Stop the worker processes, dropping the extractions which haven't started yet.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def __restart(self, broken: ProcessPoolExecutor):
+        """
+        Replace the pool after a worker process died, which breaks the whole pool.
+
+        :param broken: The broken pool, the pool isn't replaced again if it's already replaced.
+        """
+        if self.executor is not broken:
+            return
+
+        self.close()
+        self.start()
+
+    def __recycle(self, hung: ProcessPoolExecutor):
+        """
+        Replace the pool after an extraction timed out while running, and kill its workers
+        once the other extractions which were submitted to it timed out too.
+
+        :param hung: The pool with the stuck worker, the pool isn't replaced again if it's already replaced.
+        """
+        if self.executor is not hung:
+            return
+
+        # ProcessPoolExecutor has no public way to kill its workers, so this relies on its private
+        # process table, which it forgets once it's shut down. If a Python version drops the table,
+        # the stuck workers are left to exit on their own when their extractions end.
+        processes = list((getattr(hung, "_processes", None) or {}).values())
+
+        self.executor = None
+        self.start()
+
+        hung.shutdown(wait=False)
+
+        asyncio.get_running_loop().call_later(self.timeout, self.__terminate, processes)
+
+    @staticmethod
+    def __terminate(processes: List[BaseProcess]):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    @staticmethod
+    def __freeze(options: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+        return tuple(sorted(options.items()))
+
+    @staticmethod
+    def __call_soon(loop: asyncio.AbstractEventLoop, callback, *args: Any):
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(callback, *args)
+
+    @staticmethod
+    def __on_done(future: Future, stats: ExtractorStats, submitted_at: float):
+        stats.pending -= 1
+
+        if future.cancelled():
+            return
+
+        if future.exception() is not None:
+            stats.failed += 1
+            return
+
+        started_at, finished_at, _ = future.result()
+
+        stats.completed += 1
+        stats.record(submitted_at, started_at, finished_at)
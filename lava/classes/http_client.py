@@ -0,0 +1,142 @@
+from time import monotonic
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import aiohttp
+
+
+class HostStats:
+    """Request statistics of a host"""
+
+    __slots__ = ("requests", "errors", "total_latency", "max_latency")
+
+    def __init__(self):
+        self.requests: int = 0
+        self.errors: int = 0
+        self.total_latency: float = 0
+        self.max_latency: float = 0
+
+    def record(self, latency: float, error: bool):
+        self.requests += 1
+        self.errors += error
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "average_latency": self.total_latency / self.requests
+            if self.requests
+            else 0,
+            "max_latency": self.max_latency,
+        }
+
+
+class HTTPClient:
+    """
+    The pooled aiohttp session shared by all outbound HTTP requests of the bot,
+    which keeps latency and error statistics of every host.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int,
+        dns_cache_ttl: int,
+        keepalive_timeout: float,
+        timeout: float,
+    ):
+        """
+        :param limit_per_host: The maximum amount of simultaneous connections to a host.
+        :param dns_cache_ttl: How long to cache DNS lookups for in seconds.
+        :param keepalive_timeout: How long to keep idle connections open for in seconds.
+        :param timeout: The default total timeout of a request in seconds.
+        """
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+
+        self.host_stats: Dict[str, HostStats] = {}
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            raise RuntimeError("The HTTP client is not started yet!")
+
+        return self._session
+
+    async def start(self):
+        """
+        Create the session, does nothing if it's already created.
+        """
+        if self._session is not None:
+            return
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self.__on_request_start)
+        trace_config.on_request_end.append(self.__on_request_end)
+        trace_config.on_request_exception.append(self.__on_request_exception)
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[trace_config],
+        )
+
+    async def close(self):
+        """
+        Close the session and all of its connections.
+        """
+        if self._session is None:
+            return
+
+        await self._session.close()
+
+        self._session = None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the request statistics of every host.
+
+        :return: The request count, error count, average and max latency in seconds of every host.
+        """
+        return {host: stats.to_dict() for host, stats in self.host_stats.items()}
+
+    @staticmethod
+    async def __on_request_start(
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        _params: aiohttp.TraceRequestStartParams,
+    ):
+        context.started_at = monotonic()
+
+    async def __on_request_end(
+        self,
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ):
+        self.__record(params.url.host, context, params.response.status >= 400)
+
+    async def __on_request_exception(
+        self,
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestExceptionParams,
+    ):
+        self.__record(params.url.host, context, True)
+
+    def __record(self, host: str, context: SimpleNamespace, error: bool):
+        stats = self.host_stats.get(host)
+
+        if stats is None:
+            stats = self.host_stats[host] = HostStats()
+
+        stats.record(monotonic() - context.started_at, error)
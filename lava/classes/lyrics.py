@@ -0,0 +1,402 @@
+import asyncio
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from time import monotonic
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pylrc
+import syncedlyrics
+from pylrc.classes import LyricLine
+
+from lava.classes.cache import MISSING, LRUCache
+from lava.classes.sqlite_cache import SQLiteCache
+from lava.classes.worker_pool import WorkerPool
+
+lrc_timestamp_rx = re.compile(r"^\[\d+:\d+(?:\.\d+)?]", re.M)
+
+
+class LyricsTimeline:
+    """
+    Lyrics indexed by time, built once per track so lookups don't need to sort or copy the lyrics.
+    The timestamps are kept in a sorted array, and the texts in a list at the same indexes.
+    """
+
+    __slots__ = ("times", "texts")
+
+    def __init__(self, lines: Iterable[LyricLine]):
+        """
+        :param lines: The lyric lines, in any order.
+        """
+        lines = sorted(lines, key=lambda line: line.time)
+
+        self.times = array("d", (line.time for line in lines))
+        self.texts: List[str] = [line.text for line in lines]
+
+    @classmethod
+    def from_lrc(cls, lrc: str) -> "LyricsTimeline":
+        """
+        Build a timeline from LRC formatted lyrics.
+
+        :param lrc: The LRC formatted lyrics.
+        :return: The timeline of the lyrics.
+        """
+        return cls(pylrc.parse(lrc))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __iter__(self) -> Iterator[Tuple[float, str]]:
+        return zip(self.times, self.texts)
+
+    def window(self, target_seconds: float, range_seconds: float) -> slice:
+        """
+        Find the lyrics within a range after the target time.
+
+        :param target_seconds: The target time in seconds.
+        :param range_seconds: The range in seconds.
+        :return: The slice of times and texts with timestamps between
+            the target time and the target time plus the range, inclusive.
+        """
+        return slice(
+            bisect_left(self.times, target_seconds),
+            bisect_right(self.times, target_seconds + range_seconds),
+        )
+
+    def next_change(
+        self, target_seconds: float, range_seconds: float
+    ) -> Optional[float]:
+        """
+        Find when the window of the target time changes next, which is when
+        the first line in the window leaves it, or the next line enters it.
+
+        :param target_seconds: The target time in seconds.
+        :param range_seconds: The range in seconds.
+        :return: The time in seconds the window changes at, None if it never changes again.
+        """
+        window = self.window(target_seconds, range_seconds)
+
+        changes = []
+
+        if window.start < len(self.times):
+            changes.append(self.times[window.start])
+
+        if window.stop < len(self.times):
+            changes.append(self.times[window.stop] - range_seconds)
+
+        return min(changes, default=None)
+
+
+class ProviderStats:
+    """
+    Lookup statistics of a lyrics provider.
+    Searches abandoned because another provider answered first are counted apart,
+    since they didn't get to finish.
+    """
+
+    __slots__ = ("requests", "hits", "abandoned", "total_latency")
+
+    def __init__(self):
+        self.requests: int = 0
+        self.hits: int = 0
+        self.abandoned: int = 0
+        self.total_latency: float = 0
+
+    def record(self, hit: bool, latency: float):
+        """
+        Record a finished search.
+
+        :param hit: Whether the provider had lyrics.
+        :param latency: How long the search took in seconds.
+        """
+        self.requests += 1
+        self.hits += hit
+        self.total_latency += latency
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0
+
+    @property
+    def expected_latency(self) -> float:
+        """
+        The expected time to get lyrics from the provider, lower is better.
+        Providers which haven't been tried yet come first, so every provider gets measured.
+        """
+        if not self.requests:
+            return 0
+
+        if not self.hits:
+            return float("inf")
+
+        return self.average_latency / self.hit_rate
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate,
+            "average_latency": self.average_latency,
+            "abandoned": self.abandoned,
+        }
+
+
+class LyricsResolver:
+    """
+    Searches all lyrics providers at the same time and takes the first valid synced lyrics,
+    abandoning the searches of the other providers.
+
+    The providers are ranked by their observed hit rate and latency, and searched in that order
+    when the worker pool can't run all of them at once.
+    """
+
+    def __init__(self, providers: List[str], workers: WorkerPool):
+        """
+        :param providers: The names of the syncedlyrics providers to search.
+        :param workers: The worker pool to run the searches in.
+        """
+        self.workers = workers
+
+        self.providers: Dict[str, ProviderStats] = {
+            provider: ProviderStats() for provider in providers
+        }
+
+    def ranked(self) -> List[str]:
+        """
+        Get the providers from the best performing to the worst.
+
+        :return: The names of the providers.
+        """
+        return sorted(
+            self.providers,
+            key=lambda provider: self.providers[provider].expected_latency,
+        )
+
+    async def search(
+        self, term: str, workers: Optional[WorkerPool] = None
+    ) -> Optional[str]:
+        """
+        Search for the synced lyrics of a track.
+
+        :param term: The search term of the track.
+        :param workers: The worker pool to run the searches in, the pool of the resolver if None.
+        :return: The LRC formatted lyrics, None if no provider has lyrics for the track.
+        :raises asyncio.TimeoutError: If every provider timed out, so the result is unknown.
+        """
+        tasks = [
+            asyncio.create_task(self.__search(provider, term, workers or self.workers))
+            for provider in self.ranked()
+        ]
+
+        timeouts = 0
+
+        try:
+            for future in asyncio.as_completed(tasks):
+                try:
+                    lrc = await future
+                except asyncio.TimeoutError:
+                    timeouts += 1
+                    continue
+
+                if lrc:
+                    return lrc
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if timeouts == len(tasks):
+            raise asyncio.TimeoutError
+
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the statistics of every provider, from the best performing to the worst.
+
+        :return: The request and hit count, hit rate and average latency in seconds of every provider.
+        """
+        return {
+            provider: self.providers[provider].to_dict() for provider in self.ranked()
+        }
+
+    async def __search(
+        self, provider: str, term: str, workers: WorkerPool
+    ) -> Optional[str]:
+        stats = self.providers[provider]
+        started_at = monotonic()
+
+        try:
+            lrc = await workers.run(
+                syncedlyrics.search, term, False, True, None, [provider]
+            )
+        except asyncio.CancelledError:
+            stats.abandoned += 1
+            raise
+        except Exception:
+            stats.record(False, monotonic() - started_at)
+            raise
+
+        if lrc and not lrc_timestamp_rx.search(lrc):
+            lrc = None
+
+        stats.record(bool(lrc), monotonic() - started_at)
+
+        return lrc
+
+
+class LyricsCache:
+    """
+    Process wide cache of lyrics lookups, shared by all players.
+
+    Lyrics are cached by normalized title and author in memory and in a SQLite database
+    which survives restarts. Tracks without lyrics are cached too, but for a shorter time,
+    and concurrent lookups of the same track wait on a single search.
+
+    Prefetches search in their own worker pool, so they never hold up lookups of playing tracks.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_memory_items: int,
+        ttl: float,
+        missing_ttl: float,
+        prefetch_concurrency: int,
+        providers: List[str],
+        workers: int,
+        timeout: float,
+    ):
+        """
+        :param path: The path of the SQLite database.
+        :param max_memory_items: The maximum amount of lyrics to keep in memory.
+        :param ttl: How long to cache found lyrics for in seconds.
+        :param missing_ttl: How long to cache that lyrics are not found for in seconds.
+        :param prefetch_concurrency: The maximum amount of prefetches running at once.
+        :param providers: The names of the syncedlyrics providers to search.
+        :param workers: The amount of threads to search for lyrics of playing tracks with.
+        :param timeout: The deadline of a search in seconds.
+        """
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+
+        self._prefetch_slots = asyncio.Semaphore(prefetch_concurrency)
+
+        self.memory: LRUCache[str, Optional[LyricsTimeline]] = LRUCache(
+            maxsize=max_memory_items
+        )
+        self.disk = SQLiteCache(path, table="lyrics")
+        self.workers = WorkerPool("lyrics", max_workers=workers, timeout=timeout)
+        # Enough threads for every prefetch running at once to search all providers
+        self.prefetch_workers = WorkerPool(
+            "lyrics-prefetch",
+            max_workers=prefetch_concurrency * len(providers),
+            timeout=timeout,
+        )
+        self.resolver = LyricsResolver(providers, self.workers)
+
+        self.disk_hits: int = 0
+        self.searches: int = 0
+        self.prefetches: int = 0
+
+    @staticmethod
+    def key(title: str, author: str) -> str:
+        """
+        Get the cache key of a track, which ignores case and whitespace differences.
+
+        :param title: The title of the track.
+        :param author: The author of the track.
+        :return: The cache key.
+        """
+        return " ".join(f"{title} {author}".casefold().split())
+
+    async def get(self, title: str, author: str) -> Optional[LyricsTimeline]:
+        """
+        Get the lyrics of a track, searching for them if they're not cached.
+
+        :param title: The title of the track.
+        :param author: The author of the track.
+        :return: The lyrics of the track, None if the track has no lyrics.
+        """
+        return await self.__get(title, author, self.workers)
+
+    async def prefetch(self, title: str, author: str):
+        """
+        Load the lyrics of a track into memory ahead of time.
+        Prefetches take turns within a few slots, and search in the prefetch worker pool.
+
+        :param title: The title of the track.
+        :param author: The author of the track.
+        """
+        if self.key(title, author) in self.memory:
+            return
+
+        async with self._prefetch_slots:
+            self.prefetches += 1
+
+            await self.__get(title, author, self.prefetch_workers)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the cache.
+
+        :return: The memory tier, worker pools and provider statistics,
+            disk hit count, search count and prefetch count.
+        """
+        return {
+            "memory": self.memory.stats(),
+            "workers": self.workers.stats(),
+            "prefetch_workers": self.prefetch_workers.stats(),
+            "providers": self.resolver.stats(),
+            "disk_hits": self.disk_hits,
+            "searches": self.searches,
+            "prefetches": self.prefetches,
+        }
+
+    def close(self):
+        """
+        Stop the worker pools and close the disk tier.
+        """
+        self.workers.close()
+        self.prefetch_workers.close()
+        self.disk.close()
+
+    async def __get(
+        self, title: str, author: str, workers: WorkerPool
+    ) -> Optional[LyricsTimeline]:
+        key = self.key(title, author)
+
+        return await self.memory.get_or_load(
+            key,
+            lambda: self.__load(key, f"{title} {author}", workers),
+            lambda lyrics: self.missing_ttl if lyrics is None else self.ttl,
+        )
+
+    async def __load(
+        self, key: str, term: str, workers: WorkerPool
+    ) -> Optional[LyricsTimeline]:
+        loop = asyncio.get_running_loop()
+
+        lrc = await loop.run_in_executor(None, self.disk.get, key, MISSING)
+
+        if lrc is not MISSING:
+            self.disk_hits += 1
+
+            return LyricsTimeline.from_lrc(lrc) if lrc else None
+
+        self.searches += 1
+
+        lrc = await self.resolver.search(term, workers)
+
+        await loop.run_in_executor(
+            None,
+            self.disk.set,
+            key,
+            lrc or None,
+            self.ttl if lrc else self.missing_ttl,
+        )
+
+        return LyricsTimeline.from_lrc(lrc) if lrc else None
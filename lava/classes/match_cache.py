@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from lava.classes.cache import MISSING, LRUCache
+from lava.classes.sqlite_cache import SQLiteCache
+
+
+class MatchCache:
+    """
+    Process wide cache of the playable tracks matched to tracks of other services,
+    shared by all players, such as the YouTube Music track a Spotify track plays as.
+
+    Matches are cached by the ID of the original track in memory and in a SQLite database
+    which survives restarts, and concurrent lookups of the same track wait on a single search.
+    """
+
+    def __init__(self, path: str, table: str, max_memory_items: int, ttl: float):
+        """
+        :param path: The path of the SQLite database.
+        :param table: The table to store the matches in.
+        :param max_memory_items: The maximum amount of matches to keep in memory.
+        :param ttl: How long to cache a match for in seconds.
+        """
+        self.ttl = ttl
+
+        self.memory: LRUCache[str, str] = LRUCache(maxsize=max_memory_items, ttl=ttl)
+        self.disk = SQLiteCache(path, table=table)
+
+        self.disk_hits: int = 0
+        self.searches: int = 0
+
+    async def get(self, key: str, search: Callable[[], Awaitable[str]]) -> str:
+        """
+        Get the match of a track, searching for it if it's not cached.
+        Failed searches are not cached.
+
+        :param key: The ID of the original track.
+        :param search: A function returning an awaitable which searches for the match,
+            resolving to the encoded Lavalink track of the match.
+        :return: The encoded Lavalink track of the match.
+        """
+        return await self.memory.get_or_load(key, lambda: self.__load(key, search))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the cache.
+
+        :return: The memory tier statistics, disk hit count and search count.
+        """
+        return {
+            "memory": self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "searches": self.searches,
+        }
+
+    def close(self):
+        """
+        Close the disk tier.
+        """
+        self.disk.close()
+
+    async def __load(self, key: str, search: Callable[[], Awaitable[str]]) -> str:
+        loop = asyncio.get_running_loop()
+
+        encoded = await loop.run_in_executor(None, self.disk.get, key, MISSING)
+
+        if encoded is not MISSING:
+            self.disk_hits += 1
+
+            return encoded
+
+        self.searches += 1
+
+        encoded = await search()
+
+        await loop.run_in_executor(None, self.disk.set, key, encoded, self.ttl)
+
+        return encoded
@@ -1,27 +1,49 @@
 import asyncio
+import json
 from re import S
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, List, Optional, Type, Union
 
-import pylrc
-import syncedlyrics
 from disnake import ButtonStyle, Colour, Embed, Guild, Interaction, Locale, Message
 from disnake.abc import MISSING
 from disnake.ui import ActionRow, Button
-from lavalink import DefaultPlayer, Node, parse_time
-from pylrc.classes import LyricLine, Lyrics
-
+from lavalink import (
+    AudioTrack,
+    DeferredAudioTrack,
+    DefaultPlayer,
+    Filter,
+    Node,
+    parse_time,
+)
+
+from lava.classes.lyrics import LyricsTimeline
+from lava.classes.track_queue import TrackQueue
 from lava.embeds import ErrorEmbed
-from lava.utils import find_lyrics_within_range, get_image_size, get_recommended_tracks
+from lava.utils import (
+    get_artwork_size,
+    get_image_size,
+    get_recommended_tracks,
+)
 
 if TYPE_CHECKING:
     from lava.bot import Bot
 
+LYRICS_RANGE = 5.0  # How far ahead of the position the lyrics are shown, in seconds
+LYRICS_REFRESH_MARGIN = (
+    0.05  # Render slightly after a line boundary, so the line has changed
+)
+PLAYER_UPDATE_INTERVAL = 5.0  # How often Lavalink sends player updates, in seconds
+
 
 class LavaPlayer(DefaultPlayer):
     def __init__(self, bot: "Bot", guild_id: int, node: Node):
+        self.bot: Bot = bot
+
+        self.__queue: TrackQueue = TrackQueue(on_change=self.__on_queue_change)
+        self.__look_ahead: Optional[asyncio.Handle] = None
+        self.__destroyed: bool = False
+
         super().__init__(guild_id, node)
 
-        self.bot: Bot = bot
         self.message: Optional[Message] = None
         self.locale: Locale = Locale.zh_TW
 
@@ -31,14 +53,228 @@ class LavaPlayer(DefaultPlayer):
         self.is_adding_song: bool = False
         self.show_lyrics: bool = True
 
-        self.last_update: int = 0
+        self.last_update: float = 0
         self.last_position = 0
         self.position_timestamp = 0
 
-        self.__display_image_as_wide: Optional[bool] = None
-        self.__last_image_url: str = ""
+        self.__display_task: Optional[asyncio.Task] = None
+        self.__display_deadline: float = 0
+        self.__display_dirty: bool = False
+        self.__display_periodic: bool = False
+        self.__pending_message: Optional[Message] = None
+        self.__stale_messages: list[Message] = []
+        self.__last_fingerprint: Optional[tuple[int, int]] = None
+
+        self.display_edits_sent: int = 0
+        self.display_edits_skipped: int = 0
+
+        self.lyrics: Union[LyricsTimeline, None] = None
+
+        self.__lyrics_task: Optional[asyncio.Task] = None
+        self.__lyrics_refresh: Optional[asyncio.TimerHandle] = None
+        self.__prefetch_task: Optional[asyncio.Task] = None
+        self.__prefetch_track: Optional[AudioTrack] = None
+
+    @property
+    def queue(self) -> TrackQueue:
+        """
+        The upcoming tracks, the tracks coming up next are resolved ahead of time whenever it changes.
+        """
+        return self.__queue
+
+    @queue.setter
+    def queue(self, tracks: List[AudioTrack]):
+        self.__queue = TrackQueue(tracks, on_change=self.__on_queue_change)
+        self.__on_queue_change()
+
+    @property
+    def interpolated_position(self) -> int:
+        """
+        The position of the current track in milliseconds, interpolated from the last position
+        reported by Lavalink with the local clock, so it stays accurate between player updates.
+        Accounts for pauses, seeks and the playback speed of the timescale filter.
+        """
+        if not self.current:
+            return 0
+
+        if self.paused or self._internal_pause or not self.last_update:
+            return min(self.last_position, self.current.duration)
 
-        self.lyrics: Union[Lyrics[LyricLine], None] = None
+        elapsed = (self.bot.loop.time() - self.last_update) * 1000 * self.playback_speed
+
+        return min(int(self.last_position + elapsed), self.current.duration)
+
+    @property
+    def playback_speed(self) -> float:
+        """
+        How fast the track plays relative to real time, according to the timescale filter.
+        """
+        timescale = self.filters.get("timescale")
+
+        if not timescale:
+            return 1.0
+
+        return timescale.values.get("speed", 1.0) * timescale.values.get("rate", 1.0)
+
+    def update_position(self, position: int, timestamp: int):
+        """
+        Anchor the interpolated position to a position reported by Lavalink.
+
+        :param position: The position of the current track in milliseconds.
+        :param timestamp: The time the position was reported at by Lavalink, in milliseconds since epoch.
+        """
+        self.last_update = self.bot.loop.time()
+        self.last_position = position
+        self.position_timestamp = timestamp
+
+    def __anchor_position(self):
+        """
+        Anchor the interpolated position to where it is now,
+        before changing something which affects how it advances.
+        """
+        self.last_position = self.interpolated_position
+        self.last_update = self.bot.loop.time()
+
+    async def seek(self, position: int):
+        await super().seek(position)
+
+        self.last_position = max(position, 0)
+        self.last_update = self.bot.loop.time()
+
+    async def set_pause(self, pause: bool):
+        self.__anchor_position()
+
+        await super().set_pause(pause)
+
+    # Filter changes may change the playback speed of the timescale filter
+
+    async def set_filter(self, _filter: Filter):
+        self.__anchor_position()
+
+        await super().set_filter(_filter)
+
+    async def set_filters(self, *filters: Filter):
+        self.__anchor_position()
+
+        await super().set_filters(*filters)
+
+    async def update_filter(self, _filter: Type[Filter], **kwargs):
+        self.__anchor_position()
+
+        await super().update_filter(_filter, **kwargs)
+
+    async def remove_filter(self, _filter: Union[Type[Filter], str]):
+        self.__anchor_position()
+
+        await super().remove_filter(_filter)
+
+    async def clear_filters(self):
+        self.__anchor_position()
+
+        await super().clear_filters()
+
+    # The loop and shuffle modes change which tracks are coming up
+
+    def set_loop(self, loop: int):
+        super().set_loop(loop)
+
+        self.__on_queue_change()
+
+    def set_shuffle(self, shuffle: bool):
+        super().set_shuffle(shuffle)
+
+        self.__on_queue_change()
+
+    async def play_track(self, track: AudioTrack, *args, **kwargs):
+        if isinstance(track, DeferredAudioTrack):
+            self.bot.track_resolver.record(track)
+
+        return await super().play_track(track, *args, **kwargs)
+
+    def cleanup(self):
+        self.__destroyed = True
+
+        for handle in (
+            self.__look_ahead,
+            self.__lyrics_refresh,
+            self.__prefetch_task,
+            self.__lyrics_task,
+        ):
+            if handle:
+                handle.cancel()
+
+        # A render requested by the disconnect still shows the stopped player, periodic ones are dropped
+        if self.__display_task and (
+            self.__display_periodic or not self.__display_dirty
+        ):
+            self.__display_task.cancel()
+
+        self.bot.track_resolver.forget(self.guild_id)
+
+        super().cleanup()
+
+    def upcoming_tracks(self, count: int) -> List[AudioTrack]:
+        """
+        Get the tracks which may be played next.
+
+        :param count: The maximum amount of tracks to get.
+        :return: The next tracks in the queue, all of them if the next track is picked at random
+            and they fit within the count, none if the current track repeats or they don't fit.
+        """
+        if self.loop == self.LOOP_SINGLE:
+            return []
+
+        if self.shuffle:
+            return self.queue[:] if len(self.queue) <= count else []
+
+        return self.queue[:count]
+
+    def index_after(self, track: AudioTrack) -> int:
+        """
+        Get the index right after a track in the queue, to add tracks which should play after it.
+
+        :param track: The track to add after.
+        :return: The index after the track, the start of the queue if the track is playing,
+            or the end of the queue if it's no longer queued.
+        """
+        if track is self.current:
+            return 0
+
+        try:
+            return self.queue.index(track) + 1
+        except ValueError:
+            return len(self.queue)
+
+    def __on_queue_change(self):
+        """
+        Resolve the tracks coming up and prefetch the lyrics of the next track
+        once the current changes to the queue are done, so a burst of changes only does so once.
+        """
+        if self.__destroyed:
+            return
+
+        if self.__look_ahead is None:
+            self.__look_ahead = self.bot.loop.call_soon(self.__refresh_look_ahead)
+
+    def __refresh_look_ahead(self):
+        self.__look_ahead = None
+
+        self.bot.track_resolver.refresh(self)
+
+        self.prefetch_lyrics()
+
+    def has_pending_lyrics_refresh(self, within: float) -> bool:
+        """
+        Check if a lyrics refresh of the display is scheduled soon,
+        which refreshes the rest of the display as well.
+
+        :param within: How soon in seconds the refresh should be.
+        :return: True if a refresh is scheduled within the given time.
+        """
+        return (
+            self.__lyrics_refresh is not None
+            and self.__lyrics_refresh.when() - self.bot.loop.time() <= within
+        )
 
     @property
     def guild(self) -> Optional[Guild]:
@@ -47,7 +283,7 @@ class LavaPlayer(DefaultPlayer):
 
         return self._guild
 
-    async def fetch_and_update_lyrics(self) -> Union[Lyrics[LyricLine], None]:
+    async def fetch_and_update_lyrics(self) -> Union[LyricsTimeline, None]:
         """
         Fetch and update the lyrics to the cache for the current playing track.
         """
@@ -65,24 +301,35 @@ class LavaPlayer(DefaultPlayer):
             self.bot.logger.info("No current track")
             return None
 
-        try:
-            lrc = await self.bot.loop.run_in_executor(
-                None,
-                syncedlyrics.search,
-                f"{self.current.title} {self.current.author}",
-                False,
-                True,
-                None,
-                ["NetEase", "Lrclib"],
+        track = self.current
+
+        if self.__lyrics_task is None:
+            self.__lyrics_task = self.bot.loop.create_task(
+                self.bot.lyrics_cache.get(track.title, track.author)
             )
+
+        task = self.__lyrics_task
+
+        try:
+            lyrics = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+
+            return None  # The track was skipped during the lookup
         except Exception:
             return MISSING
+        finally:
+            if self.__lyrics_task is task and task.done():
+                self.__lyrics_task = None
 
-        if not lrc:
-            self.lyrics = MISSING
-            return self.lyrics
+        if self.current is not track:
+            return None
+
+        self.lyrics = lyrics or MISSING
 
-        self.lyrics = pylrc.parse(lrc)
+        if self.show_lyrics and self.message:
+            await self.update_display(periodic=True)
 
         return self.lyrics
 
@@ -143,12 +390,68 @@ class LavaPlayer(DefaultPlayer):
             if item.requester == 0:
                 self.queue.remove(item)
 
+    def prefetch_lyrics(self):
+        """
+        Prefetch the lyrics of the next track when the current track is about to end,
+        cancelling the previous prefetch if the next track has changed since.
+        Checked on every player update and queue change.
+        """
+        if self.__destroyed:
+            return
+
+        track = None
+
+        if (
+            self.current
+            and not self.current.stream
+            and self.current.duration - self.interpolated_position
+            <= self.bot.lyrics_prefetch_window * 1000
+        ):
+            track = self.__get_next_track()
+
+        if track is self.__prefetch_track:
+            return
+
+        if self.__prefetch_task:
+            self.__prefetch_task.cancel()
+
+        self.__prefetch_track = track
+        self.__prefetch_task = (
+            self.bot.loop.create_task(self.__prefetch_lyrics(track)) if track else None
+        )
+
+    def __get_next_track(self) -> Optional[AudioTrack]:
+        """
+        Get the track that will be played after the current one, if it's known in advance.
+
+        :return: The next track, None if the current track repeats,
+            the next track is picked at random, or the queue is empty.
+        """
+        if self.loop == self.LOOP_SINGLE or self.shuffle or not self.queue:
+            return None
+
+        return self.queue[0]
+
+    async def __prefetch_lyrics(self, track: AudioTrack):
+        try:
+            await self.bot.lyrics_cache.prefetch(track.title, track.author)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self.bot.logger.warning(
+                "Failed to prefetch lyrics for %s: %s", track.title, error
+            )
+
     def reset_lyrics(self):
         """
-        Reset the lyrics cache.
+        Reset the lyrics cache, and cancel the lookup of the previous track if it's still running.
         """
         self.lyrics = None
 
+        if self.__lyrics_task:
+            self.__lyrics_task.cancel()
+            self.__lyrics_task = None
+
     async def toggle_lyrics(self):
         """
         Toggle lyrics display for the player.
@@ -161,179 +464,388 @@ class LavaPlayer(DefaultPlayer):
         delay: int = 0,
         interaction: Optional[Interaction] = None,
         locale: Optional[Locale] = None,
+        periodic: bool = False,
     ) -> None:
         """
-        Update the display of the current song.
+        Request an update of the display of the current song.
+
+        Requests are coalesced, all pending requests are rendered once at the latest deadline
+        among them. Interactions are responded to immediately since they can't be delayed.
 
-        Note: If new message is provided, Old message will be deleted after 5 seconds
+        Note: If new message is provided, Old message will be deleted when the display is rendered
 
         :param new_message: The new message to update the display with, None to use the old message.
         :param delay: The delay in seconds before updating the display.
         :param interaction: The interaction to be responded to.
         :param locale: The locale to use for the display
+        :param periodic: Whether this is a periodic refresh, which has a lower priority for edit slots.
         """
+        if self.__destroyed and periodic:
+            return
+
         if interaction:
             self.locale = interaction.locale
 
         if locale:
             self.locale = locale
 
-        self.bot.logger.info(
-            "Updating display for player in guild %s in a %s seconds delay",
-            self.bot.get_guild(self.guild_id),
-            delay,
-        )
+        if new_message:
+            if self.__pending_message:
+                self.__stale_messages.append(self.__pending_message)
+
+            self.__pending_message = new_message
 
-        await asyncio.sleep(delay)
+        if interaction:
+            await self.__render_display(interaction=interaction)
+            return
 
-        if not self.message and not new_message:
+        if not self.message and not self.__pending_message:
             self.bot.logger.warning(
                 "No message to update display for player in guild %s",
                 self.bot.get_guild(self.guild_id),
             )
             return
 
-        if new_message:
-            try:
+        self.bot.logger.info(
+            "Requested display update for player in guild %s in a %s seconds delay",
+            self.bot.get_guild(self.guild_id),
+            delay,
+        )
+
+        self.__display_deadline = max(
+            self.__display_deadline, self.bot.loop.time() + delay
+        )
+        self.__display_periodic = periodic and (
+            self.__display_periodic or not self.__display_dirty
+        )
+        self.__display_dirty = True
+
+        if not periodic:
+            self.bot.edit_scheduler.promote(self.guild_id)
+
+        if self.__display_task is None:
+            self.__display_task = self.bot.loop.create_task(
+                self.__run_display_updates()
+            )
+
+    async def __run_display_updates(self):
+        """
+        Render the display until no update is pending, waiting for the deadline of each render.
+        """
+        try:
+            while self.__display_dirty:
+                while (delay := self.__display_deadline - self.bot.loop.time()) > 0:
+                    await asyncio.sleep(delay)
+
+                self.__display_dirty = False
+
+                try:
+                    await self.__render_display(periodic=self.__display_periodic)
+                except Exception as error:
+                    self.bot.logger.error(
+                        "Failed to update display for player in guild %s: %s",
+                        self.bot.get_guild(self.guild_id),
+                        error,
+                    )
+        finally:
+            self.__display_task = None
+
+    async def __render_display(
+        self, interaction: Optional[Interaction] = None, periodic: bool = False
+    ):
+        """
+        Build the display and send it to the display message.
+
+        Edits to the display message wait for a slot from the bot's edit scheduler,
+        interactions are responded to without one.
+        The edit is skipped if the display is identical to the last one sent to the message,
+        and the display is built again if the edit had to wait for its slot.
+
+        :param interaction: The interaction to be responded to.
+        :param periodic: Whether this is a periodic refresh, which has a lower priority for edit slots.
+        """
+        self.__schedule_lyrics_refresh()
+
+        if self.__pending_message:
+            for message in [self.message, *self.__stale_messages]:
+                if not message:
+                    continue
+
                 self.bot.logger.debug(
                     "Deleting old existing display message for player in guild %s",
                     self.bot.get_guild(self.guild_id),
                 )
 
-                _ = self.bot.loop.create_task(self.message.delete())
-            except (AttributeError, UnboundLocalError):
-                pass
+                _ = self.bot.loop.create_task(message.delete())
+
+            self.message = self.__pending_message
+            self.__pending_message = None
+            self.__stale_messages.clear()
+
+        # Interactions edit the message they came from, which may not be the display message
+        message = getattr(interaction, "message", None) if interaction else self.message
+
+        embeds, components, fingerprint = await self.__build_display(message)
+
+        if interaction:
+            await interaction.response.edit_message(
+                content="", embeds=embeds, components=components
+            )
+
+        else:
+            if self.__is_unchanged(fingerprint):
+                return
+
+            if not self.bot.edit_scheduler.try_acquire():
+                if not await self.bot.edit_scheduler.acquire(
+                    self.guild_id, periodic=periodic
+                ):
+                    self.bot.logger.debug(
+                        "Dropped periodic display update for player in guild %s",
+                        self.bot.get_guild(self.guild_id),
+                    )
+                    return
+
+                # The display built before waiting for the slot is outdated by now
+                embeds, components, fingerprint = await self.__build_display(message)
+
+                if self.__is_unchanged(fingerprint):
+                    return
+
+            await self.message.edit(content="", embeds=embeds, components=components)
+
+        self.__last_fingerprint = fingerprint
+        self.display_edits_sent += 1
 
-            self.message = new_message
+        self.bot.logger.debug(
+            "Updating player in guild %s display message to %s",
+            self.bot.get_guild(self.guild_id),
+            message.id if message else None,
+        )
 
+    async def __build_display(
+        self, message: Optional[Message]
+    ) -> tuple[list[Embed], list[ActionRow], Optional[tuple[int, int]]]:
+        """
+        Build the embeds and control panel of the display.
+
+        :param message: The message the display is sent to.
+        :return: The embeds, the control panel, and the fingerprint of the display on the message,
+            None if there is no message to fingerprint.
+        """
         if not self.is_connected or not self.current:
             components = []
 
         else:
-            components = [
-                ActionRow(
-                    Button(
-                        style=ButtonStyle.green,
-                        emoji=self.bot.get_icon("control.pause", "⏸️"),
-                        custom_id="control.pause",
-                        label=self.bot.get_text(
-                            "display.control.pause", self.locale, "暫停"
-                        ),
-                    )
-                    if not self.paused
-                    else Button(
-                        style=ButtonStyle.red,
-                        emoji=self.bot.get_icon("control.resume", "▶️"),
-                        custom_id="control.resume",
-                        label=self.bot.get_text(
-                            "display.control.resume", self.locale, "繼續"
-                        ),
+            components = self.__get_control_panel()
+
+        embeds = [await self.__generate_display_embed()]
+
+        if self.is_playing and self.show_lyrics:
+            embeds.append(await self.__generate_lyrics_embed())
+
+        if not message:
+            return embeds, components, None
+
+        fingerprint = (
+            message.id,
+            hash(
+                json.dumps(
+                    [
+                        [embed.to_dict() for embed in embeds],
+                        [row.to_component_dict() for row in components],
+                    ],
+                    sort_keys=True,
+                )
+            ),
+        )
+
+        return embeds, components, fingerprint
+
+    def __is_unchanged(self, fingerprint: Optional[tuple[int, int]]) -> bool:
+        """
+        Check whether a display is identical to the last one sent, counting it as skipped if it is.
+        """
+        if fingerprint is None or fingerprint != self.__last_fingerprint:
+            return False
+
+        self.display_edits_skipped += 1
+
+        self.bot.logger.debug(
+            "Display of player in guild %s is unchanged, skipping edit",
+            self.bot.get_guild(self.guild_id),
+        )
+
+        return True
+
+    def __schedule_lyrics_refresh(self):
+        """
+        Schedule a refresh of the display for when the shown lyrics change next,
+        replacing the previously scheduled refresh.
+        """
+        if self.__lyrics_refresh:
+            self.__lyrics_refresh.cancel()
+            self.__lyrics_refresh = None
+
+        if (
+            self.__destroyed
+            or not self.show_lyrics
+            or not isinstance(self.lyrics, LyricsTimeline)
+            or not self.is_playing
+            or self.paused
+        ):
+            return
+
+        position = self.interpolated_position / 1000
+        change = self.lyrics.next_change(position, LYRICS_RANGE)
+
+        if change is None:
+            return
+
+        # The lyrics are timed in track time, which passes faster than real time when sped up
+        delay = max(change - position, 0) / self.playback_speed
+
+        self.__lyrics_refresh = self.bot.loop.call_later(
+            delay + LYRICS_REFRESH_MARGIN, self.__refresh_lyrics
+        )
+
+    def __refresh_lyrics(self):
+        self.__lyrics_refresh = None
+
+        _ = self.bot.loop.create_task(self.update_display(periodic=True))
+
+    def __get_control_panel(self) -> list[ActionRow]:
+        """
+        Get the control panel components for the current state of the player.
+        The components are cached on the bot and shared by every player in the same state.
+
+        :return: The action rows of the control panel
+        """
+        key = (
+            str(self.locale),
+            self.paused,
+            self.shuffle,
+            self.loop,
+            self.autoplay,
+            self.show_lyrics,
+        )
+
+        components = self.bot.control_panels.get(key)
+
+        if components is None:
+            components = self.bot.control_panels[key] = self.__build_control_panel()
+
+        return components
+
+    def __build_control_panel(self) -> list[ActionRow]:
+        """
+        Build the control panel components for the current state of the player.
+
+        :return: The action rows of the control panel
+        """
+        return [
+            ActionRow(
+                Button(
+                    style=ButtonStyle.green,
+                    emoji=self.bot.get_icon("control.pause", "⏸️"),
+                    custom_id="control.pause",
+                    label=self.bot.get_text(
+                        "display.control.pause", self.locale, "暫停"
                     ),
-                    Button(
-                        style=ButtonStyle.blurple,
-                        emoji=self.bot.get_icon("control.previous", "⏮️"),
-                        custom_id="control.previous",
-                        label=self.bot.get_text(
-                            "display.control.previous", self.locale, "重新開始"
-                        ),
+                )
+                if not self.paused
+                else Button(
+                    style=ButtonStyle.red,
+                    emoji=self.bot.get_icon("control.resume", "▶️"),
+                    custom_id="control.resume",
+                    label=self.bot.get_text(
+                        "display.control.resume", self.locale, "繼續"
                     ),
-                    Button(
-                        style=ButtonStyle.blurple,
-                        emoji=self.bot.get_icon("control.next", "⏭️"),
-                        custom_id="control.next",
-                        label=self.bot.get_text(
-                            "display.control.next", self.locale, "跳過"
-                        ),
+                ),
+                Button(
+                    style=ButtonStyle.blurple,
+                    emoji=self.bot.get_icon("control.previous", "⏮️"),
+                    custom_id="control.previous",
+                    label=self.bot.get_text(
+                        "display.control.previous", self.locale, "重新開始"
                     ),
                 ),
-                ActionRow(
-                    Button(
-                        style=ButtonStyle.red,
-                        emoji=self.bot.get_icon("control.stop", "⏹️"),
-                        custom_id="control.stop",
-                        label=self.bot.get_text(
-                            "display.control.stop", self.locale, "停止"
-                        ),
+                Button(
+                    style=ButtonStyle.blurple,
+                    emoji=self.bot.get_icon("control.next", "⏭️"),
+                    custom_id="control.next",
+                    label=self.bot.get_text(
+                        "display.control.next", self.locale, "跳過"
                     ),
-                    Button(
-                        style=ButtonStyle.blurple,
-                        emoji=self.bot.get_icon("control.rewind", "⏪"),
-                        custom_id="control.rewind",
-                        label=self.bot.get_text(
-                            "display.control.rewind", self.locale, "倒帶十秒"
-                        ),
+                ),
+            ),
+            ActionRow(
+                Button(
+                    style=ButtonStyle.red,
+                    emoji=self.bot.get_icon("control.stop", "⏹️"),
+                    custom_id="control.stop",
+                    label=self.bot.get_text(
+                        "display.control.stop", self.locale, "停止"
                     ),
-                    Button(
-                        style=ButtonStyle.blurple,
-                        emoji=self.bot.get_icon("control.forward", "⏩"),
-                        custom_id="control.forward",
-                        label=self.bot.get_text(
-                            "display.control.forward", self.locale, "快進十秒"
-                        ),
+                ),
+                Button(
+                    style=ButtonStyle.blurple,
+                    emoji=self.bot.get_icon("control.rewind", "⏪"),
+                    custom_id="control.rewind",
+                    label=self.bot.get_text(
+                        "display.control.rewind", self.locale, "倒帶十秒"
                     ),
                 ),
-                ActionRow(
-                    Button(
-                        style=ButtonStyle.green if self.shuffle else ButtonStyle.grey,
-                        emoji=self.bot.get_icon("control.shuffle", "🔀"),
-                        custom_id="control.shuffle",
-                        label=self.bot.get_text(
-                            "display.control.shuffle", self.locale, "隨機播放"
-                        ),
+                Button(
+                    style=ButtonStyle.blurple,
+                    emoji=self.bot.get_icon("control.forward", "⏩"),
+                    custom_id="control.forward",
+                    label=self.bot.get_text(
+                        "display.control.forward", self.locale, "快進十秒"
                     ),
-                    Button(
-                        style=[
-                            ButtonStyle.grey,
-                            ButtonStyle.green,
-                            ButtonStyle.blurple,
-                        ][self.loop],
-                        emoji=self.bot.get_icon("control.repeat", "🔁"),
-                        custom_id="control.repeat",
-                        label=self.bot.get_text(
-                            "display.control.repeat", self.locale, "重複播放"
-                        ),
+                ),
+            ),
+            ActionRow(
+                Button(
+                    style=ButtonStyle.green if self.shuffle else ButtonStyle.grey,
+                    emoji=self.bot.get_icon("control.shuffle", "🔀"),
+                    custom_id="control.shuffle",
+                    label=self.bot.get_text(
+                        "display.control.shuffle", self.locale, "隨機播放"
                     ),
                 ),
-                ActionRow(
-                    Button(
-                        style=ButtonStyle.green if self.autoplay else ButtonStyle.grey,
-                        emoji=self.bot.get_icon("control.autoplay", "🎶"),
-                        custom_id="control.autoplay",
-                        label=self.bot.get_text(
-                            "display.control.autoplay", self.locale, "自動播放"
-                        ),
+                Button(
+                    style=[
+                        ButtonStyle.grey,
+                        ButtonStyle.green,
+                        ButtonStyle.blurple,
+                    ][self.loop],
+                    emoji=self.bot.get_icon("control.repeat", "🔁"),
+                    custom_id="control.repeat",
+                    label=self.bot.get_text(
+                        "display.control.repeat", self.locale, "重複播放"
                     ),
-                    Button(
-                        style=ButtonStyle.green
-                        if self.show_lyrics
-                        else ButtonStyle.grey,
-                        emoji=self.bot.get_icon("control.lyrics", "🎤"),
-                        custom_id="control.lyrics",
-                        label=self.bot.get_text(
-                            "display.control.lyrics", self.locale, "歌詞顯示"
-                        ),
+                ),
+            ),
+            ActionRow(
+                Button(
+                    style=ButtonStyle.green if self.autoplay else ButtonStyle.grey,
+                    emoji=self.bot.get_icon("control.autoplay", "🎶"),
+                    custom_id="control.autoplay",
+                    label=self.bot.get_text(
+                        "display.control.autoplay", self.locale, "自動播放"
                     ),
                 ),
-            ]
-
-        embeds = [await self.__generate_display_embed()]
-
-        if self.is_playing and self.show_lyrics:
-            embeds.append(await self.__generate_lyrics_embed())
-
-        if interaction:
-            await interaction.response.edit_message(
-                content="", embeds=embeds, components=components
-            )
-
-        else:
-            await self.message.edit(content="", embeds=embeds, components=components)
-
-        self.bot.logger.debug(
-            "Updating player in guild %s display message to %s",
-            self.bot.get_guild(self.guild_id),
-            self.message.id,
-        )
+                Button(
+                    style=ButtonStyle.green if self.show_lyrics else ButtonStyle.grey,
+                    emoji=self.bot.get_icon("control.lyrics", "🎤"),
+                    custom_id="control.lyrics",
+                    label=self.bot.get_text(
+                        "display.control.lyrics", self.locale, "歌詞顯示"
+                    ),
+                ),
+            ),
+        ]
 
     async def __generate_lyrics_embed(self) -> Embed:
         """
@@ -364,12 +876,10 @@ class LavaPlayer(DefaultPlayer):
                 color=Colour.red(),
             )
 
-        lyrics_in_range = find_lyrics_within_range(
-            self.lyrics, (self.position / 1000), 5.0
-        )
+        window = self.lyrics.window(self.interpolated_position / 1000, LYRICS_RANGE)
 
         lyrics_text = (
-            "\n".join([f"## {lyric.text}" for lyric in lyrics_in_range]) or "## ..."
+            "\n".join([f"## {text}" for text in self.lyrics.texts[window]]) or "## ..."
         )
 
         return Embed(
@@ -427,10 +937,12 @@ class LavaPlayer(DefaultPlayer):
         }
 
         if self.current:
+            position = self.interpolated_position
+
             embed.title = self.current.title
             embed.description = (
-                f"`{self.__format_time(self.position)}`"
-                f" {self.__generate_progress_bar(self.current.duration, self.position)} "
+                f"`{self.__format_time(position)}`"
+                f" {self.__generate_progress_bar(self.current.duration, position)} "
                 f"`{self.__format_time(self.current.duration)}`"
             )
 
@@ -545,29 +1057,31 @@ class LavaPlayer(DefaultPlayer):
 
         percentage = position / duration
 
-        return (
-            f"{self.bot.get_icon('progress.start_point', 'ST|')}"
-            f"{self.bot.get_icon('progress.start_fill', 'SF|') * round(percentage * 10)}"
-            f"{self.bot.get_icon('progress.mid_point', 'MP|') if percentage != 1 else self.bot.get_icon('progress.start_fill', 'SF|')}"
-            f"{self.bot.get_icon('progress.end_fill', 'EF|') * round((1 - percentage) * 10)}"
-            f"{self.bot.get_icon('progress.end', 'ED|') if percentage != 1 else self.bot.get_icon('progress.end_point', 'EP')}"
-        )
+        if percentage == 1:
+            return self.bot.progress_bars[-1]
+
+        width = self.bot.progress_bar_width
+
+        return self.bot.progress_bars[max(0, min(round(percentage * width), width))]
 
     async def is_current_artwork_wide(self) -> bool:
-        """Check if the current playing track's artwork is wide."""
+        """
+        Check if the current playing track's artwork is wide.
+        Artwork of unknown size, such as unreachable artwork, is not wide.
+        """
         if not self.current:
             return False
 
         if not self.current.artwork_url:
             return False
 
-        if self.__last_image_url == self.current.artwork_url:
-            return self.__display_image_as_wide
-
-        self.__last_image_url = self.current.artwork_url
+        size = get_artwork_size(self.current) or await get_image_size(
+            self.bot.http_client.session, self.current.artwork_url
+        )
 
-        width, height = await get_image_size(self.current.artwork_url)
+        if not size:
+            return False
 
-        self.__display_image_as_wide = width > height
+        width, height = size
 
-        return self.__display_image_as_wide
+        return width > height
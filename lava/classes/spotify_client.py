@@ -0,0 +1,235 @@
+import asyncio
+from logging import getLogger
+from time import monotonic
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from lava.classes.http_client import HTTPClient
+from lava.errors import SpotifyError
+
+API_URL = "https://api.spotify.com/v1"
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+
+class SpotifyClient:
+    """
+    An asynchronous client of the Spotify Web API, using the client credentials flow.
+
+    Requests go through the bot's pooled HTTP session. The access token is refreshed in the
+    background shortly before it expires, and rate limited requests are retried after the
+    delay Spotify asks for without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        http_client: HTTPClient,
+        refresh_margin: float = 300,
+        max_retries: int = 3,
+        max_retry_after: float = 30,
+    ):
+        """
+        :param client_id: The client ID of the Spotify application.
+        :param client_secret: The client secret of the Spotify application.
+        :param http_client: The HTTP client to make the requests with.
+        :param refresh_margin: How long before the token expires to refresh it, in seconds.
+        :param max_retries: How many times to retry a rate limited request.
+        :param max_retry_after: The longest delay to wait for a rate limited request, in seconds,
+            requests which are asked to wait longer fail instead.
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.http_client = http_client
+        self.refresh_margin = refresh_margin
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+
+        self.logger = getLogger("lava.spotify")
+
+        self.rate_limited: int = 0
+
+        self._token: Optional[str] = None
+        self._token_expires_at: float = 0
+        self._token_refresh: Optional[asyncio.Task] = None
+
+    async def track(self, track_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a track.
+
+        :param track_id: The Spotify ID of the track.
+        :return: The track object, None if not found.
+        """
+        return await self.get(f"{API_URL}/tracks/{track_id}")
+
+    async def playlist(self, playlist_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a playlist, with the first page of its tracks.
+
+        :param playlist_id: The Spotify ID of the playlist.
+        :return: The playlist object, None if not found.
+        """
+        return await self.get(f"{API_URL}/playlists/{playlist_id}")
+
+    async def playlist_snapshot(self, playlist_id: str) -> Optional[str]:
+        """
+        Get the snapshot ID of a playlist, which changes whenever the playlist is changed.
+
+        :param playlist_id: The Spotify ID of the playlist.
+        :return: The snapshot ID, None if the playlist is not found.
+        """
+        playlist = await self.get(
+            f"{API_URL}/playlists/{playlist_id}", {"fields": "snapshot_id"}
+        )
+
+        return playlist["snapshot_id"] if playlist else None
+
+    async def album(self, album_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an album, with the first page of its tracks.
+
+        :param album_id: The Spotify ID of the album.
+        :return: The album object, None if not found.
+        """
+        return await self.get(f"{API_URL}/albums/{album_id}")
+
+    async def playlist_tracks(
+        self, playlist_id: str, offset: int, limit: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a page of the tracks in a playlist.
+
+        :param playlist_id: The Spotify ID of the playlist.
+        :param offset: The index of the first track of the page.
+        :param limit: The maximum amount of tracks in the page.
+        :return: The paging object of the tracks, None if the playlist is not found.
+        """
+        return await self.get(
+            f"{API_URL}/playlists/{playlist_id}/tracks",
+            {"offset": offset, "limit": limit},
+        )
+
+    async def album_tracks(
+        self, album_id: str, offset: int, limit: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a page of the tracks on an album.
+
+        :param album_id: The Spotify ID of the album.
+        :param offset: The index of the first track of the page.
+        :param limit: The maximum amount of tracks in the page.
+        :return: The paging object of the tracks, None if the album is not found.
+        """
+        return await self.get(
+            f"{API_URL}/albums/{album_id}/tracks", {"offset": offset, "limit": limit}
+        )
+
+    async def get(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Make an authorized GET request to the Web API.
+
+        :param url: The URL of the endpoint.
+        :param params: The query parameters of the request.
+        :return: The JSON response, None if the resource is not found.
+        :raises SpotifyError: If the request failed.
+        """
+        for attempt in range(self.max_retries + 1):
+            token = await self.__get_token()
+
+            try:
+                response = await self.http_client.session.get(
+                    url, params=params, headers={"Authorization": f"Bearer {token}"}
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                raise SpotifyError(f"Failed to request Spotify: {error}") from error
+
+            async with response:
+                if response.status == 401:  # The token was revoked before it expired
+                    self._token = None
+                    continue
+
+                if response.status == 404:
+                    return None
+
+                if response.status == 429:
+                    retry_after = float(response.headers.get("Retry-After", 1))
+
+                    self.rate_limited += 1
+
+                    if (
+                        attempt == self.max_retries
+                        or retry_after > self.max_retry_after
+                    ):
+                        raise SpotifyError(
+                            f"Rate limited by Spotify, retry after {retry_after} seconds"
+                        )
+
+                    self.logger.warning(
+                        "Rate limited by Spotify, retrying in %s seconds", retry_after
+                    )
+
+                    await asyncio.sleep(retry_after)
+                    continue
+
+                if response.status >= 400:
+                    raise SpotifyError(
+                        f"Spotify responded with {response.status}: {await response.text()}"
+                    )
+
+                return await response.json()
+
+        raise SpotifyError("Gave up on the Spotify request after retrying")
+
+    async def __get_token(self) -> str:
+        """
+        Get a valid access token. The token is refreshed in the background once it's within the
+        refresh margin of expiring, and only waited for if it has already expired.
+        """
+        remaining = self._token_expires_at - monotonic()
+
+        if self._token and remaining > 0:
+            if remaining < self.refresh_margin:
+                self.__start_token_refresh()
+
+            return self._token
+
+        self.__start_token_refresh()
+
+        return await asyncio.shield(self._token_refresh)
+
+    def __start_token_refresh(self):
+        if self._token_refresh is None or self._token_refresh.done():
+            self._token_refresh = asyncio.create_task(self.__refresh_token())
+            self._token_refresh.add_done_callback(self.__on_token_refreshed)
+
+    def __on_token_refreshed(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            self.logger.error("%s", task.exception())
+
+    async def __refresh_token(self) -> str:
+        self.logger.debug("Refreshing Spotify access token")
+
+        try:
+            async with self.http_client.session.post(
+                TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
+            ) as response:
+                if response.status != 200:
+                    raise SpotifyError(
+                        f"Failed to get Spotify access token: {response.status} {await response.text()}"
+                    )
+
+                data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            raise SpotifyError(
+                f"Failed to get Spotify access token: {error}"
+            ) from error
+
+        self._token = data["access_token"]
+        self._token_expires_at = monotonic() + data["expires_in"]
+
+        return self._token
@@ -0,0 +1,99 @@
+import os
+import sqlite3
+from threading import Lock
+from time import time
+from typing import Any, Optional
+
+
+class SQLiteCache:
+    """
+    A persistent key value store with expiring entries, backed by a SQLite table.
+    The methods are blocking, run them in an executor from async code.
+    """
+
+    def __init__(self, path: str, table: str = "entries"):
+        """
+        :param path: The path of the database file, its directory is created if needed.
+        :param table: The table to store the entries in, so caches can share a database file.
+        """
+        self.path = path
+        self.table = table
+
+        directory = os.path.dirname(path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+            )
+
+        self.purge()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get the value of an entry.
+
+        :param key: The key of the entry.
+        :param default: The value to return if the entry is not found or expired.
+        :return: The value of the entry.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return default
+
+        value, expires_at = row
+
+        if expires_at is not None and expires_at <= time():
+            return default
+
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Set an entry.
+
+        :param key: The key of the entry.
+        :param value: The value of the entry, anything SQLite can store.
+        :param ttl: The time to live of the entry in seconds, None to never expire.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, None if ttl is None else time() + ttl),
+            )
+
+    def delete(self, key: str):
+        """
+        Remove an entry.
+
+        :param key: The key of the entry.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def purge(self):
+        """
+        Remove all expired entries.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at <= ?", (time(),)
+            )
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,77 @@
+from typing import Any, Callable, Iterable, Optional
+
+
+class TrackQueue(list):
+    """
+    A list of tracks which calls back after every change to it,
+    so the player can react to tracks being added, removed or reordered.
+    """
+
+    def __init__(
+        self, tracks: Iterable = (), on_change: Optional[Callable[[], Any]] = None
+    ):
+        """
+        :param tracks: The initial tracks of the queue.
+        :param on_change: The function to call after the queue changed.
+        """
+        super().__init__(tracks)
+
+        self.on_change = on_change
+
+    def __changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def append(self, track):
+        super().append(track)
+        self.__changed()
+
+    def extend(self, tracks: Iterable):
+        super().extend(tracks)
+        self.__changed()
+
+    def insert(self, index: int, track):
+        super().insert(index, track)
+        self.__changed()
+
+    def pop(self, index: int = -1):
+        track = super().pop(index)
+        self.__changed()
+
+        return track
+
+    def remove(self, track):
+        super().remove(track)
+        self.__changed()
+
+    def clear(self):
+        super().clear()
+        self.__changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.__changed()
+
+    def reverse(self):
+        super().reverse()
+        self.__changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self.__changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.__changed()
+
+    def __iadd__(self, tracks: Iterable) -> "TrackQueue":
+        super().__iadd__(tracks)
+        self.__changed()
+
+        return self
+
+    def __imul__(self, count: int) -> "TrackQueue":
+        super().__imul__(count)
+        self.__changed()
+
+        return self
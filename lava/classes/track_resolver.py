@@ -0,0 +1,155 @@
+import asyncio
+from logging import getLogger
+from typing import TYPE_CHECKING, Dict, Iterable
+from weakref import WeakSet
+
+from lavalink import Client, DeferredAudioTrack
+
+if TYPE_CHECKING:
+    from lava.classes.player import LavaPlayer
+
+
+class TrackResolver:
+    """
+    Resolves the deferred tracks coming up in the queues of all players ahead of time,
+    so they don't have to be searched for when they start playing.
+
+    Every player keeps its next few deferred tracks resolving, within a concurrency limit
+    shared by all players. Resolutions of tracks which are no longer coming up are abandoned
+    when the queue changes, resolutions which have already started can't be stopped though,
+    so they keep their slot until they're done.
+    """
+
+    def __init__(self, look_ahead: int, concurrency: int):
+        """
+        :param look_ahead: How many of the next tracks in a queue to resolve ahead of time.
+        :param concurrency: The maximum amount of resolutions running at once, across all players.
+        """
+        self.look_ahead = look_ahead
+
+        self.logger = getLogger("lava.resolver")
+
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: Dict[int, Dict[int, asyncio.Task]] = {}
+        self._played: "WeakSet[DeferredAudioTrack]" = WeakSet()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.resolved: int = 0
+        self.failed: int = 0
+        self.abandoned: int = 0
+
+    def refresh(self, player: "LavaPlayer"):
+        """
+        Start resolving the tracks coming up in the queue of a player,
+        and abandon the resolutions of the tracks which are no longer coming up.
+
+        :param player: The player whose queue changed.
+        """
+        self.__update(
+            player.guild_id, player.client, player.upcoming_tracks(self.look_ahead)
+        )
+
+    def forget(self, guild_id: int):
+        """
+        Abandon the resolutions of a player, when it's destroyed.
+
+        :param guild_id: The guild ID of the player.
+        """
+        self.__update(guild_id, None, ())
+
+        self._tasks.pop(guild_id, None)
+
+    def record(self, track: DeferredAudioTrack):
+        """
+        Record whether a track was resolved ahead of time when it starts playing.
+        Only the first play of a track counts, repeats are always resolved.
+
+        :param track: The track which is starting.
+        """
+        if track in self._played:
+            return
+
+        self._played.add(track)
+
+        if track.track:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the statistics of the resolver.
+
+        :return: The hit and miss count of tracks starting, the hit rate,
+            and the amount of resolutions pending, done, failed and abandoned.
+        """
+        played = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / played if played else 0,
+            "pending": sum(len(tasks) for tasks in self._tasks.values()),
+            "resolved": self.resolved,
+            "failed": self.failed,
+            "abandoned": self.abandoned,
+        }
+
+    def __update(
+        self, guild_id: int, client: Client, upcoming: Iterable[DeferredAudioTrack]
+    ):
+        tasks = self._tasks.setdefault(guild_id, {})
+
+        wanted = {
+            id(track): track
+            for track in upcoming
+            if isinstance(track, DeferredAudioTrack) and not track.track
+        }
+
+        for key in [key for key in tasks if key not in wanted]:
+            tasks.pop(key).cancel()
+
+            self.abandoned += 1
+
+        for key, track in wanted.items():
+            if key in tasks:
+                continue
+
+            task = asyncio.create_task(self.__resolve(client, track))
+            task.add_done_callback(
+                lambda t, k=key: tasks.pop(k) if tasks.get(k) is t else None
+            )
+
+            tasks[key] = task
+
+    async def __resolve(self, client: Client, track: DeferredAudioTrack):
+        await self._slots.acquire()
+
+        if track.track:
+            self._slots.release()
+            return
+
+        # Loads carry on when the resolution is abandoned, so the slot is held until the load is done
+        loading = asyncio.ensure_future(track.load(client))
+        loading.add_done_callback(lambda future: self.__on_loaded(track, future))
+
+        await asyncio.wait((loading,))
+
+    def __on_loaded(self, track: DeferredAudioTrack, future: asyncio.Future):
+        self._slots.release()
+
+        if future.cancelled():
+            return
+
+        error = future.exception()
+
+        if error is not None:
+            self.failed += 1
+
+            self.logger.warning(
+                "Failed to resolve %s ahead of time: %s", track.title, error
+            )
+            return
+
+        self.resolved += 1
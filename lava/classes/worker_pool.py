@@ -0,0 +1,154 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Timing:
+    """When a call was submitted to the pool and when a worker started running it"""
+
+    __slots__ = ("submitted_at", "started_at")
+
+    def __init__(self):
+        self.submitted_at: float = monotonic()
+        self.started_at: Optional[float] = None
+
+
+class WorkerPool:
+    """
+    A dedicated thread pool for blocking calls, so they can't take up the threads of the default executor.
+
+    Every call has a deadline, and calls which are cancelled or time out before a worker picks them up
+    are never run. Calls which are already running can't be interrupted, their results are discarded instead.
+    """
+
+    def __init__(self, name: str, max_workers: int, timeout: Optional[float]):
+        """
+        :param name: The name of the pool, used as the prefix of the thread names.
+        :param max_workers: The amount of threads in the pool.
+        :param timeout: The deadline of each call in seconds, None for no deadline.
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+
+        self.queued: int = 0
+        self.running: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.cancelled: int = 0
+        self.timed_out: int = 0
+
+        self.total_wait: float = 0
+        self.max_wait: float = 0
+        self.total_run: float = 0
+        self.max_run: float = 0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking function in the pool.
+
+        :param func: The function to run.
+        :param args: The arguments to call the function with.
+        :return: The return value of the function.
+        :raises asyncio.TimeoutError: If the call didn't finish before its deadline.
+        """
+        loop = asyncio.get_running_loop()
+        timing = _Timing()
+
+        future = self.executor.submit(self.__call, loop, timing, func, args)
+        self.queued += 1
+
+        future.add_done_callback(
+            lambda f: self.__call_soon(loop, self.__on_done, f, timing, monotonic())
+        )
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the statistics of the pool.
+
+        :return: The worker count, the amount of calls in each state,
+            and the average and max queue wait and run time in seconds.
+        """
+        started = self.completed + self.failed
+
+        return {
+            "workers": self.max_workers,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "timed_out": self.timed_out,
+            "average_wait": self.total_wait / (started + self.running)
+            if started + self.running
+            else 0,
+            "max_wait": self.max_wait,
+            "average_run": self.total_run / started if started else 0,
+            "max_run": self.max_run,
+        }
+
+    def close(self):
+        """
+        Stop the pool, dropping the calls which haven't started yet.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __call(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        timing: _Timing,
+        func: Callable[..., T],
+        args: tuple,
+    ) -> T:
+        """
+        Runs in a worker thread, the statistics are only updated on the event loop.
+        """
+        timing.started_at = monotonic()
+
+        self.__call_soon(loop, self.__on_start, timing)
+
+        return func(*args)
+
+    @staticmethod
+    def __call_soon(loop: asyncio.AbstractEventLoop, callback: Callable, *args: Any):
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(callback, *args)
+
+    def __on_start(self, timing: _Timing):
+        wait = timing.started_at - timing.submitted_at
+
+        self.queued -= 1
+        self.running += 1
+
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def __on_done(self, future: Future, timing: _Timing, finished_at: float):
+        if future.cancelled():
+            self.queued -= 1
+            self.cancelled += 1
+            return
+
+        run = finished_at - timing.started_at
+
+        self.running -= 1
+
+        if future.exception() is None:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+        self.total_run += run
+        self.max_run = max(self.max_run, run)
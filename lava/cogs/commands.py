@@ -30,6 +30,7 @@ from lava.bot import Bot
 from lava.classes.player import LavaPlayer
 from lava.embeds import ErrorEmbed, InfoEmbed, SuccessEmbed, WarningEmbed
 from lava.errors import UserInDifferentChannel
+from lava.source import PagedLoadResult
 from lava.utils import (
     bytes_to_gb,
     ensure_voice,
@@ -299,20 +300,7 @@ class Commands(Cog):
 
                 # noinspection PyTypeChecker
                 await interaction.edit_original_response(
-                    embeds=[
-                        SuccessEmbed(
-                            title=f"{self.bot.get_text('command.play.loaded.title', interaction.locale, '已加入播放序列')} {len(results.tracks)} / {results.playlist_info.name}",
-                            description="\n".join(
-                                [
-                                    f"**[{index + 1}]** {track.title}"
-                                    for index, track in enumerate(results.tracks[:10])
-                                ]
-                            )
-                            + "..."
-                            if len(results.tracks) > 10
-                            else "",
-                        )
-                    ]
+                    embeds=[self.__generate_playlist_embed(interaction, results)]
                     + filter_warnings
                 )
 
@@ -320,12 +308,63 @@ class Commands(Cog):
         if not player.is_playing:
             await player.play()
 
+        # Playback has started with the first page, add the pages which are still loading
+        # right after the playlist, the queue may have changed since the first page was added
+        if isinstance(results, PagedLoadResult):
+            try:
+                async for tracks in results.remaining:
+                    page_index = player.index_after(results.tracks[-1])
+
+                    for iter_index, track in enumerate(tracks):
+                        player.add(
+                            requester=interaction.author.id,
+                            track=track,
+                            index=page_index + iter_index,
+                        )
+
+                    results.tracks.extend(tracks)
+            except Exception as error:
+                self.bot.logger.error(
+                    "Failed to load the remaining tracks of %s: %s",
+                    results.playlist_info.name,
+                    error,
+                )
+
+            # noinspection PyTypeChecker
+            await interaction.edit_original_response(
+                embeds=[self.__generate_playlist_embed(interaction, results)]
+                + filter_warnings
+            )
+
         player.set_shuffle(shuffle=shuffle)
 
         await player.update_display(
             await interaction.original_response(), delay=5, locale=interaction.locale
         )
 
+    def __generate_playlist_embed(
+        self, interaction: ApplicationCommandInteraction, results: LoadResult
+    ) -> SuccessEmbed:
+        """
+        Generate the embed of a playlist added to the queue.
+
+        :param interaction: The interaction which added the playlist.
+        :param results: The load result of the playlist.
+        :return: The generated embed.
+        """
+        return SuccessEmbed(
+            title=f"{self.bot.get_text('command.play.loaded.title', interaction.locale, '已加入播放序列')} {len(results.tracks)} / {results.playlist_info.name}",
+            description="\n".join(
+                [
+                    f"**[{index + 1}]** {track.title}"
+                    for index, track in enumerate(results.tracks[:10])
+                ]
+            )
+            + "..."
+            if len(results.tracks) > 10
+            else "",
+        )
+
     @commands.slash_command(
         name=Localized("skip", key="command.skip.name"),
         description=Localized("跳過當前播放的歌曲", key="command.skip.description"),
@@ -16,7 +16,7 @@ from lavalink import (
 )
 
 from lava.bot import Bot
-from lava.classes.player import LavaPlayer
+from lava.classes.player import PLAYER_UPDATE_INTERVAL, LavaPlayer
 from lava.embeds import ErrorEmbed
 from lava.errors import (
     BotNotInVoice,
@@ -52,17 +52,21 @@ class Events(Cog):
         self.bot.logger.info("Received player update event for guild %s", player.guild)
 
         if hasattr(event, "position") and hasattr(event, "timestamp"):
-            player.last_update = event.timestamp
-            player.last_position = event.position
-            player.position_timestamp = event.timestamp
+            player.update_position(event.position, event.timestamp)
 
         _ = self.bot.loop.create_task(player.check_autoplay())
 
         if player.lyrics is None:
             _ = self.bot.loop.create_task(player.fetch_and_update_lyrics())
 
+        player.prefetch_lyrics()
+
+        # The lyrics refresh updates the progress bar as well
+        if player.has_pending_lyrics_refresh(within=PLAYER_UPDATE_INTERVAL):
+            return
+
         try:
-            await player.update_display()
+            await player.update_display(periodic=True)
         except ValueError:
             pass
 
@@ -71,6 +75,7 @@ class Events(Cog):
 
         self.bot.logger.info("Received track start event for guild %s", player.guild)
 
+        player.update_position(0, 0)
         player.reset_lyrics()
 
         _ = self.bot.loop.create_task(player.fetch_and_update_lyrics())
@@ -241,10 +246,10 @@ class Events(Cog):
                     player.set_loop(player.loop + 1 if player.loop < 2 else 0)
 
                 case "control.rewind":
-                    await player.seek(round(player.position) - 10000)
+                    await player.seek(max(player.interpolated_position - 10000, 0))
 
                 case "control.forward":
-                    await player.seek(round(player.position) + 10000)
+                    await player.seek(player.interpolated_position + 10000)
 
                 case "control.autoplay":
                     await player.toggle_autoplay()
@@ -22,3 +22,11 @@ class UserInDifferentChannel(Exception):
 
 class LoadError(Exception):
     pass
+
+
+class SpotifyError(Exception):
+    pass
+
+
+class ExtractionError(Exception):
+    pass
@@ -1,9 +1,23 @@
+import asyncio
 import re
 from logging import getLogger
 from os import getenv
-from typing import Union, Tuple, Optional
+from time import monotonic
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    NamedTuple,
+    Union,
+    Tuple,
+    Optional,
+)
+from urllib.parse import urlparse
 
 from lavalink import (
+    AudioTrack,
     Source,
     Client,
     LoadResult,
@@ -11,19 +25,26 @@ from lavalink import (
     PlaylistInfo,
     DeferredAudioTrack,
 )
-from spotipy import Spotify, SpotifyClientCredentials
-from yt_dlp import YoutubeDL
-from yt_dlp.utils import UnsupportedError, DownloadError
 
-from lava.errors import LoadError
+from lava.classes.cache import LRUCache
+from lava.classes.extraction_cache import ExtractedMedia
+from lava.classes.spotify_client import SpotifyClient
+from lava.errors import ExtractionError, LoadError, SpotifyError
+
+if TYPE_CHECKING:
+    from lava.bot import Bot
+
+YTDL_OPTIONS = {"format": "bestaudio"}
 
 
 class BaseSource:
-    def __init__(self):
+    def __init__(self, bot: "Bot"):
         """
         Inits the source
+        :param bot: The bot this source loads tracks for
         :raise ValueError if the current state is not ok to use this source
         """
+        self.bot = bot
         self.priority: int = 0
 
     def check_query(self, query: str) -> bool:
@@ -49,9 +70,38 @@ class SpotifyAudioTrack(DeferredAudioTrack):
 
         self.track = None
 
+        self.__loading: Optional[asyncio.Future] = None
+
     async def load(self, client):  # skipcq: PYL-W0201
+        """
+        Resolve the track to a playable track, joining the resolution in progress if there is one,
+        so a track resolved ahead of time is never searched for twice.
+        Cancelling a call only stops waiting for the resolution, not the resolution itself.
+        """
+        if self.track:
+            return self.track
+
+        if self.__loading is None or self.__loading.done():
+            self.__loading = asyncio.ensure_future(self.__load(client))
+
+        return await asyncio.shield(self.__loading)
+
+    async def __load(self, client) -> str:
         getLogger("lava.sources").info("Loading spotify track %s...", self.title)
 
+        base64 = await client.bot.spotify_matches.get(
+            self.identifier, lambda: self.__search(client)
+        )
+        self.track = base64
+
+        getLogger("lava.sources").info("Loaded spotify track %s", self.title)
+
+        return base64
+
+    async def __search(self, client) -> str:
+        """
+        Search YouTube Music for the track, only done if the match of the track isn't cached
+        """
         result: LoadResult = await client.get_tracks(
             f"ytmsearch:{self.title} {self.author}"
         )
@@ -59,29 +109,78 @@ class SpotifyAudioTrack(DeferredAudioTrack):
         if result.load_type != LoadType.SEARCH or not result.tracks:
             raise LoadError
 
-        first_track = result.tracks[0]
-        base64 = first_track.track
-        self.track = base64
+        return result.tracks[0].track
 
-        getLogger("lava.sources").info("Loaded spotify track %s", self.title)
 
-        return base64
+class PagedLoadResult(LoadResult):
+    """
+    A load result of which only the first page of tracks is loaded,
+    so playback can start while the other pages are still loading.
+    """
+
+    __slots__ = ("remaining",)
+
+    def __init__(
+        self,
+        load_type: LoadType,
+        tracks: list,
+        playlist_info: PlaylistInfo,
+        remaining: AsyncIterator[list[AudioTrack]],
+    ):
+        """
+        :param remaining: The tracks of the remaining pages, in order as they're loaded
+        """
+        super().__init__(load_type, tracks, playlist_info)
+
+        self.remaining = remaining
+
+
+class SpotifyTrackInfo(NamedTuple):
+    """The fields of a Spotify track its audio track is built from, as cached"""
+
+    id: str
+    name: str
+    author: str
+    duration: int
+    artwork_url: Optional[str]
+    artwork_size: Optional[Tuple[int, int]]
+
+
+class SpotifyListInfo(NamedTuple):
+    """A Spotify playlist or album with all of its tracks, as cached"""
+
+    name: str
+    tracks: Tuple[SpotifyTrackInfo, ...]
+    snapshot_id: Optional[str] = None
+    checked_at: float = 0
 
 
 class SpotifySource(BaseSource):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, bot: "Bot"):
+        super().__init__(bot)
 
         self.priority = 5
 
-        spotify_client_id = getenv("SPOTIFY_CLIENT_ID")
-        spotify_client_secret = getenv("SPOTIFY_CLIENT_SECRET")
+        self.spotify_client = SpotifyClient(
+            client_id=getenv("SPOTIFY_CLIENT_ID"),
+            client_secret=getenv("SPOTIFY_CLIENT_SECRET"),
+            http_client=bot.http_client,
+        )
 
-        credentials = SpotifyClientCredentials(
-            client_id=spotify_client_id, client_secret=spotify_client_secret
+        self.page_slots = asyncio.Semaphore(
+            int(getenv("SPOTIFY_PAGE_CONCURRENCY", "4"))
         )
 
-        self.spotify_client = Spotify(auth_manager=credentials)
+        # Keyed by the type and ID of the object, playlists never expire from the cache,
+        # they're revalidated against their snapshot ID once their TTL is over instead
+        self.metadata: LRUCache[
+            Tuple[str, str], Union[SpotifyTrackInfo, SpotifyListInfo]
+        ] = LRUCache(maxsize=int(getenv("SPOTIFY_METADATA_CACHE_ITEMS", "512")))
+        self.metadata_ttls = {
+            "track": float(getenv("SPOTIFY_TRACK_CACHE_TTL", str(24 * 60 * 60))),
+            "album": float(getenv("SPOTIFY_ALBUM_CACHE_TTL", str(24 * 60 * 60))),
+            "playlist": float(getenv("SPOTIFY_PLAYLIST_CACHE_TTL", "300")),
+        }
 
     def check_query(self, query: str) -> bool:
         spotify_url_rx = (
@@ -94,26 +193,26 @@ class SpotifySource(BaseSource):
         return False
 
     async def load_item(self, client: Client, query: str):
-        track = self.__load_track(query)
+        track = await self.__load_track(query)
 
         if track:
             return LoadResult(LoadType.TRACK, [track], PlaylistInfo.none())
 
-        playlist, playlist_info = self.__load_playlist(query)
+        playlist = await self.__load_playlist(query)
 
         if playlist:
-            return LoadResult(LoadType.PLAYLIST, playlist, playlist_info)
+            return playlist
 
-        album, playlist_info = self.__load_album(query)
+        album = await self.__load_album(query)
 
         if album:
-            return LoadResult(LoadType.PLAYLIST, album, playlist_info)
+            return album
 
         return None
 
-    def __load_track(self, url: str) -> Union[SpotifyAudioTrack, None]:
+    async def __load_track(self, url: str) -> Union[SpotifyAudioTrack, None]:
         """
-        Get a track with given url from spotify, None if not found
+        Get a track with given url from spotify or the metadata cache, None if not found
         :param url: Spotify track url
         :return: SpotifyAudioTrack
         """
@@ -122,114 +221,283 @@ class SpotifySource(BaseSource):
         if not track_id:
             return None
 
-        track = self.spotify_client.track(track_id)
+        info = self.metadata.get(("track", track_id))
 
-        if track:
-            return SpotifyAudioTrack(
-                {
-                    "identifier": track["id"],
-                    "isSeekable": True,
-                    "author": ", ".join(
-                        [artist["name"] for artist in track["artists"]]
-                    ),
-                    "length": track["duration_ms"],
-                    "isStream": False,
-                    "title": track["name"],
-                    "uri": f"https://open.spotify.com/track/{track['id']}",
-                    "artworkUrl": track["album"]["images"][0]["url"],
-                },
-                requester=0,
+        if info is None:
+            track = await self.spotify_client.track(track_id)
+
+            if not track:
+                return None
+
+            info = self.__get_track_info(
+                track, *self.__get_artwork(track["album"]["images"])
             )
-        return None
 
-    def __load_playlist(
+            self.metadata.set(("track", track_id), info, self.metadata_ttls["track"])
+
+        return self.__build_track(info)
+
+    async def __load_playlist(
         self, url: str
-    ) -> Tuple[list[SpotifyAudioTrack], Union[PlaylistInfo, None]]:
+    ) -> Union[LoadResult, PagedLoadResult, None]:
         """
-        Get tracks in a playlist with given url from spotify, None if not found
+        Get a playlist with given url from spotify, None if not found.
+        A cached playlist is loaded at once, after checking that it's unchanged if its TTL is over,
+        or without checking if Spotify can't be reached.
+        Otherwise only the first page of tracks is loaded,
+        and the other pages are loaded by iterating the remaining pages of the result
         :param url: Spotify playlist url
-        :return: list[SpotifyAudioTrack], PlaylistInfo
+        :return: LoadResult if cached, PagedLoadResult if not
         """
         playlist_id = self.__get_playlist_id_from_url(url)
 
         if not playlist_id:
-            return [], None
+            return None
 
-        playlist = self.spotify_client.playlist(playlist_id)
+        key = ("playlist", playlist_id)
+        cached = self.metadata.get(key)
+
+        if cached and monotonic() - cached.checked_at > self.metadata_ttls["playlist"]:
+            try:
+                snapshot = await self.spotify_client.playlist_snapshot(playlist_id)
+            except SpotifyError as error:
+                # Keep it stale so it's checked again next time
+                getLogger("lava.sources").warning(
+                    "Failed to check if playlist %s changed, using the cached copy: %s",
+                    playlist_id,
+                    error,
+                )
 
-        playlist_info = PlaylistInfo(playlist["name"], -1)
+                return self.__build_list(cached)
 
-        if playlist:
-            tracks = []
-
-            for track in playlist["tracks"]["items"]:
-                tracks.append(
-                    SpotifyAudioTrack(
-                        {
-                            "identifier": track["track"]["id"],
-                            "isSeekable": True,
-                            "author": ", ".join(
-                                [artist["name"] for artist in track["track"]["artists"]]
-                            ),
-                            "length": track["track"]["duration_ms"],
-                            "isStream": False,
-                            "title": track["track"]["name"],
-                            "uri": f"https://open.spotify.com/track/{track['track']['id']}",
-                            "artworkUrl": track["track"]["album"]["images"][0]["url"]
-                            if track["track"]["album"].get("images")
-                            else None,
-                        },
-                        requester=0,
-                    )
-                )
+            if snapshot and snapshot == cached.snapshot_id:
+                cached = cached._replace(checked_at=monotonic())
+                self.metadata.set(key, cached, None)
+            else:
+                self.metadata.pop(key)
+                cached = None
 
-            return tracks, playlist_info
-        return [], None
+        if cached:
+            return self.__build_list(cached)
 
-    def __load_album(
-        self, url: str
-    ) -> Tuple[list[SpotifyAudioTrack], Union[PlaylistInfo, None]]:
+        playlist = await self.spotify_client.playlist(playlist_id)
+
+        if not playlist:
+            return None
+
+        def parse(page: dict) -> list[SpotifyTrackInfo]:
+            return [
+                self.__get_track_info(
+                    item["track"],
+                    *self.__get_artwork(item["track"]["album"].get("images")),
+                )
+                for item in page["items"]
+                if item.get("track")
+            ]
+
+        first_tracks = parse(playlist["tracks"])
+
+        return PagedLoadResult(
+            LoadType.PLAYLIST,
+            [self.__build_track(info) for info in first_tracks],
+            PlaylistInfo(playlist["name"], -1),
+            remaining=self.__load_pages(
+                playlist["tracks"],
+                lambda offset, limit: self.spotify_client.playlist_tracks(
+                    playlist_id, offset, limit
+                ),
+                parse,
+                lambda tracks: self.metadata.set(
+                    key,
+                    SpotifyListInfo(
+                        playlist["name"],
+                        (*first_tracks, *tracks),
+                        playlist.get("snapshot_id"),
+                        monotonic(),
+                    ),
+                    None,
+                ),
+            ),
+        )
+
+    async def __load_album(self, url: str) -> Union[LoadResult, PagedLoadResult, None]:
         """
-        Get tracks on an album with given url from spotify, None if not found
+        Get an album with given url from spotify, None if not found.
+        A cached album is loaded at once, otherwise only the first page of tracks is loaded,
+        and the other pages are loaded by iterating the remaining pages of the result
         :param url: Spotify album url
-        :return: list[SpotifyAudioTrack], PlaylistInfo
+        :return: LoadResult if cached, PagedLoadResult if not
         """
         album_id = self.__get_album_id_from_url(url)
 
         if not album_id:
-            return [], None
+            return None
 
-        album = self.spotify_client.album(album_id)
+        key = ("album", album_id)
+        cached = self.metadata.get(key)
 
-        playlist_info = PlaylistInfo(album["name"], -1)
+        if cached:
+            return self.__build_list(cached)
 
-        if album:
-            tracks = []
-
-            for track in album["tracks"]["items"]:
-                tracks.append(
-                    SpotifyAudioTrack(
-                        {
-                            "identifier": track["id"],
-                            "isSeekable": True,
-                            "author": ", ".join(
-                                [artist["name"] for artist in track["artists"]]
-                            ),
-                            "length": track["duration_ms"],
-                            "isStream": False,
-                            "title": track["name"],
-                            "uri": f"https://open.spotify.com/track/{track['id']}",
-                            "artworkUrl": album["images"][0]["url"]
-                            if album.get("images")
-                            else None,
-                        },
-                        requester=0,
-                    )
-                )
+        album = await self.spotify_client.album(album_id)
+
+        if not album:
+            return None
+
+        artwork_url, artwork_size = self.__get_artwork(album.get("images"))
+
+        def parse(page: dict) -> list[SpotifyTrackInfo]:
+            return [
+                self.__get_track_info(track, artwork_url, artwork_size)
+                for track in page["items"]
+            ]
+
+        first_tracks = parse(album["tracks"])
+
+        return PagedLoadResult(
+            LoadType.PLAYLIST,
+            [self.__build_track(info) for info in first_tracks],
+            PlaylistInfo(album["name"], -1),
+            remaining=self.__load_pages(
+                album["tracks"],
+                lambda offset, limit: self.spotify_client.album_tracks(
+                    album_id, offset, limit
+                ),
+                parse,
+                lambda tracks: self.metadata.set(
+                    key,
+                    SpotifyListInfo(album["name"], (*first_tracks, *tracks)),
+                    self.metadata_ttls["album"],
+                ),
+            ),
+        )
+
+    async def __load_pages(
+        self,
+        first_page: dict,
+        fetch: Callable[[int, int], Awaitable[Optional[dict]]],
+        parse: Callable[[dict], list[SpotifyTrackInfo]],
+        on_complete: Callable[[list[SpotifyTrackInfo]], Any],
+    ) -> AsyncIterator[list[SpotifyAudioTrack]]:
+        """
+        Load the pages after the first one concurrently, within the page loading limit of the source
+        :param first_page: The first page of the paging object, which tells the page size and total
+        :param fetch: A function fetching the page at an offset with a limit
+        :param parse: A function parsing the tracks of a page
+        :param on_complete: A function called with the tracks of all the pages after the first one,
+            once every page is loaded
+        :return: The tracks of each page, in order
+        """
+        limit = first_page["limit"]
+
+        async def load(offset: int) -> Optional[list[SpotifyTrackInfo]]:
+            async with self.page_slots:
+                page = await fetch(offset, limit)
+
+            return parse(page) if page else None
+
+        tasks = [
+            asyncio.create_task(load(offset))
+            for offset in range(
+                first_page["offset"] + limit, first_page["total"], limit
+            )
+        ]
 
-            return tracks, playlist_info
+        loaded = []
+        complete = True
 
-        return [], None
+        try:
+            for task in tasks:
+                infos = await task
+
+                if infos is None:
+                    complete = False
+                    continue
+
+                loaded.extend(infos)
+
+                yield [self.__build_track(info) for info in infos]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if complete:
+            on_complete(loaded)
+
+    def __build_list(self, cached: SpotifyListInfo) -> LoadResult:
+        """
+        Build a load result from a cached playlist or album
+        :param cached: The cached playlist or album
+        :return: LoadResult
+        """
+        return LoadResult(
+            LoadType.PLAYLIST,
+            [self.__build_track(info) for info in cached.tracks],
+            PlaylistInfo(cached.name, -1),
+        )
+
+    @staticmethod
+    def __get_track_info(
+        track: dict,
+        artwork_url: Optional[str],
+        artwork_size: Optional[Tuple[int, int]],
+    ) -> SpotifyTrackInfo:
+        """
+        Get the fields of a spotify track object which its audio track is built from
+        :param track: Spotify track object
+        :param artwork_url: The url of the artwork of the track
+        :param artwork_size: The width and height of the artwork
+        :return: SpotifyTrackInfo
+        """
+        return SpotifyTrackInfo(
+            track["id"],
+            track["name"],
+            ", ".join([artist["name"] for artist in track["artists"]]),
+            track["duration_ms"],
+            artwork_url,
+            artwork_size,
+        )
+
+    @staticmethod
+    def __build_track(info: SpotifyTrackInfo) -> SpotifyAudioTrack:
+        """
+        Build an audio track from the fields of a spotify track
+        :param info: The fields of the spotify track
+        :return: SpotifyAudioTrack
+        """
+        return SpotifyAudioTrack(
+            {
+                "identifier": info.id,
+                "isSeekable": True,
+                "author": info.author,
+                "length": info.duration,
+                "isStream": False,
+                "title": info.name,
+                "uri": f"https://open.spotify.com/track/{info.id}",
+                "artworkUrl": info.artwork_url,
+            },
+            requester=0,
+            artwork_size=info.artwork_size,
+        )
+
+    @staticmethod
+    def __get_artwork(
+        images: Optional[list],
+    ) -> Tuple[Optional[str], Optional[Tuple[int, int]]]:
+        """
+        Get the largest artwork and its size from spotify images
+        :param images: Spotify images, ordered by size
+        :return: Artwork url and its width and height, None if not available
+        """
+        if not images:
+            return None, None
+
+        image = images[0]
+
+        if not image.get("width") or not image.get("height"):
+            return image["url"], None
+
+        return image["url"], (image["width"], image["height"])
 
     @staticmethod
     def __get_track_id_from_url(url: str) -> Union[str, None]:
@@ -281,11 +549,10 @@ class SpotifySource(BaseSource):
 
 
 class BilibiliSource(BaseSource):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, bot: "Bot"):
+        super().__init__(bot)
 
         self.priority = 5
-        self.ytdl = YoutubeDL({"format": "bestaudio"})
 
     def check_query(self, query: str) -> bool:
         return query.startswith("https://www.bilibili.com/video/") or query.startswith(
@@ -293,24 +560,28 @@ class BilibiliSource(BaseSource):
         )
 
     async def load_item(self, client: Client, query: str) -> Optional[LoadResult]:
-        audio_url, title, author, thumbnail = self.get_audio(query)
-
-        track = (await client.get_tracks(audio_url, check_local=False)).tracks[0]
+        try:
+            return await self.bot.extraction_cache.load(
+                query,
+                lambda: self.get_audio(query),
+                lambda media: self.__load_media(client, query, media),
+            )
 
-        track.title = title
-        track.author = f"{author} / [Bilibili]({query})"
-        track.artwork_url = thumbnail
+        except ExtractionError:
+            return None
 
-        return LoadResult(load_type=LoadType.TRACK, tracks=[track], playlist_info=None)
+        except asyncio.TimeoutError:
+            getLogger("lava.sources").warning("Timed out extracting %s", query)
+            return None
 
-    def get_audio(self, url: str) -> Tuple[str, str, str, str]:
+    async def get_audio(self, url: str) -> ExtractedMedia:
         """
         Gets audio from a Bilibili video URL
 
         :param url: Bilibili video URL
-        :return: Tuple of audio URL, video title, video author, video thi,
+        :return: Audio URL, video title, video author, video thumbnail and video URL
         """
-        info = self.ytdl.extract_info(url, download=False)
+        info = await self.bot.extractor_pool.extract("Bilibili", url, YTDL_OPTIONS)
 
         audio_url = info["formats"][1]["url"]
 
@@ -320,17 +591,35 @@ class BilibiliSource(BaseSource):
 
         title = info.get("fulltitle", None)
 
-        return audio_url, title, author, thumbnail
+        return ExtractedMedia(audio_url, title, author, thumbnail, url)
+
+    @staticmethod
+    async def __load_media(
+        client: Client, query: str, media: ExtractedMedia
+    ) -> Optional[LoadResult]:
+        """
+        Load the audio of a Bilibili video with lavalink, None if lavalink failed to load it
+        """
+        tracks = (await client.get_tracks(media.url, check_local=False)).tracks
+
+        if not tracks:
+            return None
+
+        track = tracks[0]
+
+        track.title = media.title
+        track.author = f"{media.author} / [Bilibili]({query})"
+        track.artwork_url = media.thumbnail
+
+        return LoadResult(load_type=LoadType.TRACK, tracks=[track], playlist_info=None)
 
 
 class YTDLSource(BaseSource):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, bot: "Bot"):
+        super().__init__(bot)
 
         self.priority = 0
 
-        self.ytdl = YoutubeDL({"format": "bestaudio"})
-
     def check_query(self, query: str) -> bool:
         youtube_url_rx = r"^(https?://(www\.)?(youtube\.com|music\.youtube\.com)/(watch\?v=|playlist\?list=)([a-zA-Z0-9_-]+))"
 
@@ -344,37 +633,78 @@ class YTDLSource(BaseSource):
 
     async def load_item(self, client: Client, query: str) -> Optional[LoadResult]:
         try:
-            url_info = self.ytdl.extract_info(query, download=False)
+            return await self.bot.extraction_cache.load(
+                query,
+                lambda: self.__extract(query),
+                lambda media: self.__load_media(client, media),
+            )
 
-            if "entries" in url_info:
-                url_info = url_info["entries"][0]
+        except ExtractionError:
+            return None
 
-        except (UnsupportedError, DownloadError):
+        except asyncio.TimeoutError:
+            getLogger("lava.sources").warning("Timed out extracting %s", query)
             return None
 
-        try:
-            track = (await client.get_tracks(url_info["formats"][-1]["url"])).tracks[0]
+    async def __extract(self, query: str) -> ExtractedMedia:
+        url_info = await self.bot.extractor_pool.extract(
+            self.__get_extractor_name(query), query, YTDL_OPTIONS
+        )
+
+        if "entries" in url_info:
+            url_info = url_info["entries"][0]
+
+        return ExtractedMedia(
+            url_info["formats"][-1]["url"],
+            url_info["title"],
+            None,
+            None,
+            url_info["webpage_url"],
+        )
+
+    @staticmethod
+    async def __load_media(
+        client: Client, media: ExtractedMedia
+    ) -> Optional[LoadResult]:
+        """
+        Load extracted media with lavalink, None if lavalink failed to load it
+        """
+        tracks = (await client.get_tracks(media.url)).tracks
 
-        except IndexError:
+        if not tracks:
             return None
 
+        track = tracks[0]
+
         match = re.match(
             r"^(?:https?:\/\/)?(?:[^@\n]+@)?(?:www\.)?([^:\/\n]+)",
-            url_info["webpage_url"],
+            media.webpage_url,
         )
 
-        track.title = url_info["title"]
+        track.title = media.title
         track.author = f"Unknown / [{match.group(1)}]({match.group(0)})"
 
         return LoadResult(
             load_type=LoadType.TRACK, tracks=[track], playlist_info=PlaylistInfo.none()
         )
 
+    @staticmethod
+    def __get_extractor_name(url: str) -> str:
+        """
+        Get the name to record the extraction statistics of an url under
+        :param url: The url to extract
+        :return: The host of the url, without www.
+        """
+        host = urlparse(url).hostname or "unknown"
+
+        return host[4:] if host.startswith("www.") else host
+
 
 class SourceManager(Source):
-    def __init__(self):
+    def __init__(self, bot: "Bot"):
         super().__init__(name="LavaSourceManager")
 
+        self.bot = bot
         self.sources: list[BaseSource] = []
 
         self.logger = getLogger("lava.sources")
@@ -387,7 +717,7 @@ class SourceManager(Source):
         for cls in BaseSource.__subclasses__():
             self.logger.debug(f"Initializing {cls.__name__}...")
 
-            self.sources.append(cls())
+            self.sources.append(cls(self.bot))
 
         self.sources.sort(key=lambda x: x.priority, reverse=True)
 
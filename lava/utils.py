@@ -1,5 +1,7 @@
+import asyncio
+import re
+import struct
 import subprocess
-from bisect import bisect_left
 from io import BytesIO
 from typing import Iterable, Optional, TYPE_CHECKING, Tuple
 
@@ -8,8 +10,8 @@ import imageio
 from disnake import Interaction
 from disnake.utils import get
 from lavalink import AudioTrack
-from pylrc.classes import LyricLine
 
+from lava.classes.cache import LRUCache
 from lava.classes.voice_client import LavalinkVoiceClient
 from lava.errors import (
     UserNotInVoice,
@@ -21,6 +23,33 @@ from lava.errors import (
 if TYPE_CHECKING:
     from lava.classes.player import LavaPlayer
 
+IMAGE_PROBE_CHUNK_SIZE = 4 * 1024
+IMAGE_PROBE_LIMIT = 256 * 1024
+# How long to remember that the size of an image is unknown, in seconds
+IMAGE_PROBE_FAILURE_TTL = 300
+
+# Start of frame markers, 0xC4, 0xC8 and 0xCC are other segments in the same range
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Sizes of the YouTube thumbnail variants, https://i.ytimg.com/vi/<id>/<variant>.jpg
+YOUTUBE_THUMBNAIL_SIZES = {
+    "default": (120, 90),
+    "mqdefault": (320, 180),
+    "hqdefault": (480, 360),
+    "sddefault": (640, 480),
+    "hq720": (1280, 720),
+    "maxresdefault": (1280, 720),
+}
+
+youtube_thumbnail_rx = re.compile(
+    r"^https?://i\d?\.ytimg\.com/vi(?:_webp)?/[\w-]+/(\w+)\.(?:jpg|webp)"
+)
+googleusercontent_size_rx = re.compile(
+    r"^https?://[\w.]+\.googleusercontent\.com/.+=w(\d+)-h(\d+)"
+)
+
+image_sizes: LRUCache[str, Optional[Tuple[int, int]]] = LRUCache(maxsize=4096)
+
 
 def get_current_branch() -> str:
     """
@@ -167,43 +196,154 @@ async def get_recommended_tracks(
     return results
 
 
-async def get_image_size(url: str) -> Optional[Tuple[int, int]]:
+def get_artwork_size(track: AudioTrack) -> Optional[Tuple[int, int]]:
+    """
+    Get the size of the artwork of a track without downloading it,
+    from the size provided by the source or the known sizes of the artwork URL.
+
+    :param track: The track to get the artwork size of.
+    :return: The width and height of the artwork, None if it's unknown.
+    """
+    if track.extra.get("artwork_size"):
+        return track.extra["artwork_size"]
+
+    if not track.artwork_url:
+        return None
+
+    if match := youtube_thumbnail_rx.match(track.artwork_url):
+        return YOUTUBE_THUMBNAIL_SIZES.get(match.group(1))
+
+    if match := googleusercontent_size_rx.match(track.artwork_url):
+        return int(match.group(1)), int(match.group(2))
+
+    return None
+
+
+async def get_image_size(
+    session: aiohttp.ClientSession, url: str
+) -> Optional[Tuple[int, int]]:
     """
     Get the size of the image from the given URL.
+    Sizes are cached by URL, and concurrent calls for the same URL share a single probe.
+    Unknown sizes are only cached for a short time, so unreachable images are probed again later.
 
+    :param session: The session to make the request with.
     :param url: The URL of the image.
-    :return The width and height of the image. If the image is not found, return None.
+    :return The width and height of the image. If the image is not found or unreachable, return None.
     """
-    async with aiohttp.ClientSession() as session, session.get(url) as response:
-        if response.status != 200:
-            return None
+    return await image_sizes.get_or_load(
+        url,
+        lambda: probe_image_size(session, url),
+        lambda size: IMAGE_PROBE_FAILURE_TTL if size is None else None,
+    )
+
+
+async def probe_image_size(
+    session: aiohttp.ClientSession, url: str
+) -> Optional[Tuple[int, int]]:
+    """
+    Get the size of the image from the given URL by only reading the headers of the image.
+    Falls back to decoding the image if its format is unknown and it's small enough.
+
+    :param session: The session to make the request with.
+    :param url: The URL of the image.
+    :return The width and height of the image. If the image is not found or unreachable, return None.
+    """
+    headers = {"Range": f"bytes=0-{IMAGE_PROBE_LIMIT - 1}"}
+
+    data = bytearray()
+
+    try:
+        async with session.get(url, headers=headers) as response:
+            if response.status not in (200, 206):
+                return None
+
+            async for chunk in response.content.iter_chunked(IMAGE_PROBE_CHUNK_SIZE):
+                data += chunk
+
+                size = parse_image_size(data)
+
+                if size:
+                    return size
 
-        data = await response.read()
+                if len(data) >= IMAGE_PROBE_LIMIT:
+                    return None
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+
+    try:
         img = imageio.imread(BytesIO(data))
+    except Exception:
+        return None
 
-        return img.shape[1], img.shape[0]
+    return img.shape[1], img.shape[0]
 
 
-def find_lyrics_within_range(
-    lyrics: list[LyricLine], target_seconds: float, range_seconds: float
-) -> list[LyricLine]:
+def parse_image_size(data: bytes) -> Optional[Tuple[int, int]]:
     """
-    Find lyrics within a range of the target time.
-    :param lyrics: The lyrics to search from.
-    :param target_seconds: The target time in seconds.
-    :param range_seconds: The range in seconds.
-    :return: The lyrics within the range and the index of the closest lyric.
+    Parse the size of an image from the beginning of its data, supports PNG, GIF, WebP and JPEG.
+
+    :param data: The beginning of the image data.
+    :return: The width and height of the image, None if the data isn't enough or the format is unknown.
     """
-    lyrics.sort(key=lambda x: x.time)
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
 
-    start_index = bisect_left([lyric.time for lyric in lyrics], target_seconds)
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
 
-    result = []
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
 
-    for i in range(start_index, len(lyrics)):
-        if lyrics[i].time - target_seconds > range_seconds:
-            break
-        if 0 <= lyrics[i].time - target_seconds <= range_seconds:
-            result.append(lyrics[i])
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+
+        if chunk == b"VP8X":
+            return (
+                int.from_bytes(data[24:27], "little") + 1,
+                int.from_bytes(data[27:30], "little") + 1,
+            )
+
+        return None
+
+    if data[:2] == b"\xff\xd8":
+        return parse_jpeg_size(data)
+
+    return None
+
+
+def parse_jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Parse the size of a JPEG image by walking its segments to the start of frame.
+
+    :param data: The beginning of the image data.
+    :return: The width and height of the image, None if the start of frame isn't in the data.
+    """
+    index = 2
+
+    while index + 9 <= len(data):
+        if data[index] != 0xFF:
+            return None
+
+        marker = data[index + 1]
+
+        if marker == 0xFF:  # Padding
+            index += 1
+            continue
+
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", data[index + 5 : index + 9])
+            return width, height
+
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # Markers without a length
+            index += 2
+            continue
+
+        index += 2 + struct.unpack(">H", data[index + 2 : index + 4])[0]
 
-    return result
+    return None
@@ -33,7 +33,7 @@ def main():
         command_sync_flags=CommandSyncFlags.default(),
     )
 
-    bot.i18n.load("locale/")
+    bot.load_locales("locale/")
 
     load_extensions(bot)
 